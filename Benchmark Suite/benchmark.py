@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite — offline performance checks for every project in this repository
+
+Each tool is run on synthetic data at several sizes. Wall time, peak memory
+(RSS) and throughput are written to a JSON results file, and the run can be
+compared against a stored baseline to flag regressions.
+
+Usage:
+    python benchmark.py                          # quick sizes → benchmark_results.json
+    python benchmark.py --sizes full             # every size (slow: up to 1e8 rows)
+    python benchmark.py --suite translator --suite flashcards
+    python benchmark.py --save-baseline          # also store this run as the baseline
+    python benchmark.py --baseline benchmark_baseline.json --threshold 0.2
+
+Notes:
+- Every case runs in a fresh process, so peak RSS belongs to that case alone.
+- Suites whose libraries are missing (NumPy, pandas) are reported as skipped.
+- Exit status is 1 when a regression against the baseline is found.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = "benchmark_results.json"
+BASELINE_FILE = "benchmark_baseline.json"
+
+# "quick" runs the first QUICK_SIZES sizes of every case, "full" runs them all
+QUICK_SIZES = 2
+
+# suite: short name used on the command line
+# sizes: problem sizes, smallest first
+# units: work done for one size (defaults to the size itself), for throughput
+Case = namedtuple("Case", ["suite", "name", "unit", "sizes", "setup", "run", "units"])
+
+
+# --- Loading the projects ---
+
+PROJECTS = {
+    "translator": ("DNA → RNA Converter + Codon Translator", "dna_rna_translator.py"),
+    "flashcards": ("Biology Flashcards Generator", "biology_flashcards_generator.py"),
+    "enzyme": ("Enzyme Activity Visualizer", "enzyme_activity.py"),
+    "foodchain": ("Food Chain Simulator", "simulator.py"),
+    "heartrate": ("Heart Rate Analyzer", "heart_rate.py"),
+    "plants": ("Plant Classification Tool", "classifier.py"),
+}
+
+
+def load_project(suite):
+    """Import a project's script by path (the folder names contain spaces)."""
+    folder, filename = PROJECTS[suite]
+    name = os.path.splitext(filename)[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, folder, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Synthetic data ---
+
+_DNA_BYTES = bytes.maketrans(bytes(range(256)), bytes(b"ACGT"[i & 3] for i in range(256)))
+
+
+def random_dna(n, seed=0):
+    rng = random.Random(seed)
+    blocks = []
+    for start in range(0, n, 1 << 20):
+        size = min(1 << 20, n - start)
+        blocks.append(rng.getrandbits(8 * size).to_bytes(size, "little").translate(_DNA_BYTES))
+    return b"".join(blocks).decode("ascii")
+
+
+def synthetic_deck(n_cards, seed=0):
+    rng = random.Random(seed)
+    deck = {}
+    for i in range(n_cards):
+        chapter = f"Chapter {i % max(n_cards // 100, 1)}"
+        deck.setdefault(chapter, []).append({
+            "question": f"Question {i}: what does term {rng.randrange(10 ** 6)} mean?",
+            "answer": f"Answer {i}: it describes process {rng.randrange(10 ** 6)} in cells.",
+        })
+    return deck
+
+
+def write_heart_rate_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    activities = ["rest", "walking", "running", "cycling"]
+    with open(path, "w") as f:
+        f.write("time,activity,heart_rate\n")
+        for start in range(0, rows, 100_000):
+            lines = []
+            for i in range(start, min(start + 100_000, rows)):
+                activity = activities[rng.randrange(4)]
+                rate = rng.randint(60, 80) if activity == "rest" else rng.randint(90, 160)
+                lines.append(f"{i // 60 % 24:02d}:{i % 60:02d},{activity},{rate}\n")
+            f.write("".join(lines))
+
+
+# --- Cases ---
+# setup(size, workdir) returns the state passed to run(state); only run is timed.
+
+def _translator_setup(size, workdir):
+    t = load_project("translator")
+    return t, t.dna_to_rna(random_dna(size))
+
+
+def _translator_stream_setup(size, workdir):
+    t = load_project("translator")
+    path = os.path.join(workdir, "genome.fa")
+    seq = random_dna(size)
+    with open(path, "w") as f:
+        f.write(">synthetic\n")
+        for i in range(0, len(seq), 60):
+            f.write(seq[i:i + 60] + "\n")
+    return t, path
+
+
+def _translator_stream_run(state):
+    t, path = state
+    with open(os.devnull, "w") as out:
+        t.translate_file(path, out, to_stop=False)
+
+
+def _require_numpy_translator(size, workdir):
+    t, rna = _translator_setup(size, workdir)
+    if t.np is None:
+        raise ImportError("numpy")
+    return t, rna
+
+
+def _deck_save_setup(size, workdir):
+    fc = load_project("flashcards")
+    return fc, synthetic_deck(size), os.path.join(workdir, "flashcards_db.json")
+
+
+def _deck_load_setup(size, workdir):
+    fc, deck, path = _deck_save_setup(size, workdir)
+    fc.save_db(deck, path)
+    return fc, path
+
+
+def _deck_add_save_run(state):
+    fc, deck, path = state
+    fc.add_flashcard(deck, "Benchmark", "Extra question?", "Extra answer.")
+    fc.save_db(deck, path)
+
+
+def _journal_add_setup(size, workdir):
+    fc, path = _deck_load_setup(size, workdir)
+    db = fc.load_db(path)
+    return fc, db, fc.Journal(db, path, compact_bytes=1 << 40)
+
+
+def _journal_add_run(state):
+    fc, db, journal = state
+    for i in range(ADDS_PER_RUN):
+        fc.add_flashcard(db, "Benchmark", f"Extra question {i}?", "Extra answer.", journal=journal)
+    journal.sync()
+
+
+def _import_setup(size, workdir):
+    fc = load_project("flashcards")
+    path = os.path.join(workdir, "import.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("chapter,question,answer\n")
+        for chapter, cards in synthetic_deck(size).items():
+            for fc_card in cards:
+                f.write(f"{chapter},{fc_card['question']},{fc_card['answer']}\n")
+    return fc, path
+
+
+def _import_run(state):
+    fc, path = state
+    fc.import_cards({}, fc.read_import_rows(path), progress=False)
+
+
+def _export_setup(size, workdir):
+    return load_project("flashcards"), synthetic_deck(size), os.path.join(workdir, "export")
+
+
+def _sqlite_setup(size, workdir):
+    fc = load_project("flashcards")
+    path = os.path.join(workdir, "flashcards_db.sqlite3")
+    store = fc.SQLiteDB(path)
+    store.add_many(synthetic_deck(size))
+    store.close()
+    return fc, path
+
+
+def _sqlite_load_run(state):
+    fc, path = state
+    db = fc.load_db(path, "sqlite")
+    fc.get_flashcards(db, fc.list_chapters(db)[0])
+    db.close()
+
+
+def _sqlite_add_setup(size, workdir):
+    fc, path = _sqlite_setup(size, workdir)
+    return fc, fc.load_db(path, "sqlite")
+
+
+def _sqlite_add_run(state):
+    fc, db = state
+    for i in range(ADDS_PER_RUN):
+        fc.add_flashcard(db, "Benchmark", f"Extra question {i}?", "Extra answer.")
+
+
+def _chains_setup(size, workdir):
+    return load_project("foodchain"), size, os.path.join(workdir, "chains.csv")
+
+
+def _chains_run(state):
+    sim, n, path = state
+    chains = [sim.build_chain_random() for _ in range(n)]
+    sim.export_csv(chains, path)
+
+
+def _validate_setup(size, workdir):
+    sim = load_project("foodchain")
+    path = os.path.join(workdir, "chains.csv")
+    sim.export_random(size, path, seed=0)
+    return sim, path
+
+
+def _enzyme_setup(size, workdir):
+    enzyme = load_project("enzyme")
+    np = enzyme.np
+    return enzyme, np.linspace(0, 80, size), np.linspace(0, 14, size)
+
+
+def _enzyme_render_setup(size, workdir):
+    enzyme = load_project("enzyme")
+    return enzyme, enzyme.enzyme_params(resolution=size), os.path.join(workdir, "figures")
+
+
+def _enzyme_render_run(state):
+    enzyme, params, out_dir = state
+    enzyme.cached_grid.cache_clear()
+    enzyme.cached_curve.cache_clear()
+    enzyme.render(params=params, output_dir=out_dir)
+
+
+def _enzyme_batch_setup(size, workdir):
+    enzyme = load_project("enzyme")
+    rng = random.Random(0)
+    table = [(f"enzyme{i}", enzyme.enzyme_params(rng.uniform(20, 70), rng.uniform(4, 15),
+                                                  rng.uniform(3, 10), rng.uniform(0.5, 2), resolution=100))
+             for i in range(size)]
+    return enzyme, table, workdir
+
+
+def _enzyme_batch_run(state):
+    enzyme, table, workdir = state
+    enzyme.render_batch(table, tempfile.mkdtemp(dir=workdir))
+
+
+def _enzyme_fit_setup(size, workdir):
+    enzyme = load_project("enzyme")
+    np = enzyme.np
+    rng = np.random.default_rng(0)
+    points = FIT_POINTS_PER_ENZYME
+    group = np.repeat(np.arange(size), points)
+    optimum, width = rng.uniform(20, 70, size), rng.uniform(4, 15, size)
+    temp = np.tile(np.linspace(0, 80, points), size)
+    activity = enzyme.enzyme_activity_temp(temp, optimum[group], width[group])
+    activity += rng.normal(0, 0.02, len(activity))
+    return enzyme, group, temp, activity
+
+
+def _kinetics_setup(size, workdir):
+    enzyme = load_project("enzyme")
+    rng = enzyme.np.random.default_rng(0)
+    conditions = enzyme.np.column_stack([rng.uniform(10, 60, size), rng.uniform(4, 10, size),
+                                         10 ** rng.uniform(-1, 2, size), 10 ** rng.uniform(-2, 1, size),
+                                         10 ** rng.uniform(-1, 1.5, size)])
+    return enzyme, conditions, os.path.join(workdir, "kinetics.csv")
+
+
+def _heart_rate_setup(size, workdir):
+    hr = load_project("heartrate")
+    path = os.path.join(workdir, "heart_rate.csv")
+    write_heart_rate_csv(path, size)
+    return hr, path
+
+
+def _heart_rate_run(state):
+    hr, path = state
+    resting, active = hr.split_rates(hr.load_data(path))
+    hr.summary_lines(resting, active)
+
+
+def _plants_setup(size, workdir):
+    rng = random.Random(0)
+    options = [("simple", "compound"), ("parallel", "reticulate", "none"),
+               ("radial", "bilateral", "none"), ("yes", "no"), ("yes", "no")]
+    plants = [tuple(rng.choice(choices) for choices in options) for _ in range(size)]
+    return load_project("plants"), plants
+
+
+def _plants_run(state):
+    classifier, plants = state
+    for plant in plants:
+        classifier.classify(*plant)
+
+
+SEQUENCE_SIZES = [1_000, 100_000, 10_000_000, 100_000_000]
+DECK_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+ADDS_PER_RUN = 100
+FIT_POINTS_PER_ENZYME = 15
+
+CASES = [
+    Case("translator", "rna_to_protein[python]", "bases", SEQUENCE_SIZES, _translator_setup,
+         lambda s: s[0].rna_to_protein(s[1], to_stop=False), None),
+    Case("translator", "rna_to_protein[numpy]", "bases", SEQUENCE_SIZES, _require_numpy_translator,
+         lambda s: s[0].rna_to_protein(s[1], to_stop=False, backend="numpy"), None),
+    Case("translator", "translate_file", "bases", SEQUENCE_SIZES, _translator_stream_setup,
+         _translator_stream_run, None),
+    Case("flashcards", "save_db", "cards", DECK_SIZES, _deck_save_setup,
+         lambda s: s[0].save_db(s[1], s[2]), None),
+    Case("flashcards", "load_db", "cards", DECK_SIZES, _deck_load_setup,
+         lambda s: s[0].load_db(s[1]), None),
+    Case("flashcards", "add+save_db[json]", "cards", DECK_SIZES, _deck_save_setup,
+         _deck_add_save_run, None),
+    Case("flashcards", "add_flashcard[journal]", "adds", DECK_SIZES, _journal_add_setup,
+         _journal_add_run, lambda size: ADDS_PER_RUN),
+    Case("flashcards", "import_cards[csv]", "rows", DECK_SIZES, _import_setup, _import_run, None),
+    Case("flashcards", "find_duplicate_clusters", "cards", DECK_SIZES,
+         lambda size, workdir: (load_project("flashcards"), synthetic_deck(size)),
+         lambda s: s[0].find_duplicate_clusters(s[1]), None),
+    Case("flashcards", "export_deck[all formats]", "cards", DECK_SIZES, _export_setup,
+         lambda s: s[0].export_deck(s[1], s[2]), None),
+    Case("flashcards", "load_db[sqlite]", "cards", DECK_SIZES, _sqlite_setup,
+         _sqlite_load_run, None),
+    Case("flashcards", "add_flashcard[sqlite]", "adds", DECK_SIZES, _sqlite_add_setup,
+         _sqlite_add_run, lambda size: ADDS_PER_RUN),
+    Case("foodchain", "random+export_csv", "chains", [1_000, 100_000, 10_000_000, 100_000_000],
+         _chains_setup, _chains_run, None),
+    Case("foodchain", "export_random[csv]", "chains", [1_000, 100_000, 10_000_000, 100_000_000],
+         _chains_setup, lambda s: s[0].export_random(s[1], s[2]), None),
+    Case("foodchain", "export_random[binary]", "chains", [1_000, 100_000, 10_000_000, 100_000_000],
+         _chains_setup, lambda s: s[0].export_random(s[1], s[2], "binary"), None),
+    Case("foodchain", "export_random[csv, all CPUs]", "chains", [1_000, 100_000, 10_000_000, 100_000_000],
+         _chains_setup, lambda s: s[0].export_random(s[1], s[2], seed=0, workers=os.cpu_count()), None),
+    Case("foodchain", "iter_invalid_rows", "rows", [1_000, 100_000, 10_000_000, 100_000_000],
+         _validate_setup, lambda s: sum(1 for _ in s[0].iter_invalid_rows(s[1])), None),
+    Case("enzyme", "activity_grid", "cells", [100, 400, 2_000, 5_000], _enzyme_setup,
+         lambda s: s[0].activity_grid(s[1], s[2]), lambda size: size * size),
+    Case("enzyme", "render[headless]", "plots", [100, 400, 1_000], _enzyme_render_setup,
+         _enzyme_render_run, lambda size: 5),
+    Case("enzyme", "render_batch", "figures", [5, 20, 200], _enzyme_batch_setup, _enzyme_batch_run,
+         lambda size: 5 * size),
+    Case("enzyme", "fit_curves", "enzymes", [1_000, 10_000, 100_000, 1_000_000], _enzyme_fit_setup,
+         lambda s: s[0].fit_curves(s[1], s[2], s[3]), lambda size: size),
+    Case("enzyme", "run_kinetics[rk4]", "reactions", [1_000, 10_000, 100_000, 1_000_000], _kinetics_setup,
+         lambda s: s[0].run_kinetics(s[1], s[2]), lambda size: size),
+    Case("enzyme", "run_kinetics[adaptive]", "reactions", [1_000, 10_000, 100_000, 1_000_000], _kinetics_setup,
+         lambda s: s[0].run_kinetics(s[1], s[2], adaptive=True), lambda size: size),
+    Case("heartrate", "load+summary", "rows", [10_000, 1_000_000, 10_000_000, 100_000_000],
+         _heart_rate_setup, _heart_rate_run, None),
+    Case("plants", "classify", "plants", [1_000, 100_000, 1_000_000], _plants_setup, _plants_run, None),
+]
+
+
+# --- Running ---
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _case_worker(index, size, repeat, conn):
+    """Child process: set up one case, time it and send back the measurements."""
+    case = CASES[index]
+    try:
+        with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+            state = case.setup(size, workdir)
+            setup_rss = peak_rss_mb()
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                case.run(state)
+                times.append(time.perf_counter() - start)
+        conn.send({"seconds": min(times), "setup_rss_mb": setup_rss, "peak_rss_mb": peak_rss_mb()})
+    except ImportError as e:
+        conn.send({"skipped": f"missing dependency: {e.name or e}"})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(index, size, repeat=1, timeout=None):
+    case = CASES[index]
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_case_worker, args=(index, size, repeat, child))
+    process.start()
+    child.close()
+    outcome = None
+    if parent.poll(timeout):
+        try:
+            outcome = parent.recv()
+        except EOFError:
+            pass
+    process.join(5)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        outcome = outcome or {"error": f"timed out after {timeout}s"}
+    if outcome is None:
+        outcome = {"error": f"process died (exit code {process.exitcode})"}
+
+    result = {"suite": case.suite, "case": case.name, "size": size, "unit": case.unit}
+    result.update(outcome)
+    if "seconds" in outcome:
+        units = case.units(size) if case.units else size
+        result["throughput"] = units / outcome["seconds"] if outcome["seconds"] > 0 else None
+    return result
+
+
+def run_benchmarks(suites=None, sizes="quick", repeat=1, timeout=None, progress=print):
+    results = []
+    for index, case in enumerate(CASES):
+        if suites and case.suite not in suites:
+            continue
+        case_sizes = case.sizes if sizes == "full" else case.sizes[:QUICK_SIZES]
+        for size in case_sizes:
+            result = run_case(index, size, repeat, timeout)
+            results.append(result)
+            progress(format_result(result))
+            if "skipped" in result:
+                break
+    return results
+
+
+# --- Reporting ---
+
+def format_result(result, baseline=None):
+    label = f"{result['suite']:<10} {result['case']:<24} {result['size']:>12,}"
+    if "skipped" in result:
+        return f"{label}  skipped ({result['skipped']})"
+    if "error" in result:
+        return f"{label}  FAILED ({result['error']})"
+    rss = f"{result['peak_rss_mb']:8.1f} MB" if result.get("peak_rss_mb") is not None else "       n/a"
+    rate = f"{result['throughput']:,.0f} {result['unit']}/s" if result.get("throughput") else "n/a"
+    line = f"{label}  {result['seconds']:9.4f}s  {rss}  {rate}"
+    if baseline is not None:
+        change = result["seconds"] / baseline["seconds"] - 1 if baseline["seconds"] else 0.0
+        line += f"  ({change:+.1%} vs baseline)"
+    return line
+
+
+def result_key(result):
+    return result["suite"], result["case"], result["size"]
+
+
+def compare(results, baseline, threshold, min_seconds=0.0):
+    """Return (result, baseline_result) pairs that got slower by more than threshold.
+
+    Cases faster than min_seconds are ignored; their timings are mostly noise.
+    """
+    previous = {result_key(r): r for r in baseline.get("results", []) if "seconds" in r}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if not old or "seconds" not in result or result["seconds"] < min_seconds:
+            continue
+        if result["seconds"] > old["seconds"] * (1 + threshold):
+            regressions.append((result, old))
+    return regressions
+
+
+def save_results(results, filename):
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Suite for the Biology Projects")
+    parser.add_argument("--suite", action="append", choices=sorted(PROJECTS),
+                        help="Only run this suite (repeatable; default: all)")
+    parser.add_argument("--sizes", choices=["quick", "full"], default="quick",
+                        help=f"quick runs the {QUICK_SIZES} smallest sizes, full runs all (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per case; the fastest is kept (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Give up on a case after this many seconds")
+    parser.add_argument("--output", default=RESULTS_FILE,
+                        help="Results JSON file (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="Baseline JSON file to compare against (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Also write this run to the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slow-down that counts as a regression (default: %(default)s = 10%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="Ignore regressions in cases faster than this (default: %(default)s)")
+
+    args = parser.parse_args()
+
+    print(f"Running {args.sizes} benchmarks...\n")
+    results = run_benchmarks(args.suite, args.sizes, args.repeat, args.timeout)
+    save_results(results, args.output)
+    print(f"\n✔ Results written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        previous = {result_key(r): r for r in baseline.get("results", []) if "seconds" in r}
+        print(f"\nCompared with {args.baseline} ({baseline.get('timestamp', 'unknown date')}):")
+        for result in results:
+            if "seconds" in result and result_key(result) in previous:
+                print(format_result(result, previous[result_key(result)]))
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n✘ {len(regressions)} regression(s) slower than the baseline by more than {args.threshold:.0%}:")
+            for result, old in regressions:
+                print(f"  {result['suite']} {result['case']} @ {result['size']:,}: "
+                      f"{old['seconds']:.4f}s → {result['seconds']:.4f}s")
+        else:
+            print("\n✔ No regressions.")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"✔ Baseline saved to {args.baseline}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
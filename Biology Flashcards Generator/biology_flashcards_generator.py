@@ -6,27 +6,94 @@ Single-file Python CLI for generating, viewing, saving, and quizzing on biology
 Features:
 - Built-in example chapters: Plant Physiology, Cell Organelles, Biomolecules
 - Ask for a chapter name to generate Q&A flashcards
-- Add new flashcards to a chapter
-- Save / Load flashcards to JSON (flashcards_db.json)
-- Export a chapter's flashcards to a plain text file
-- Quiz mode to test yourself
+- Add new flashcards to a chapter, or edit existing ones
+- Save / Load flashcards to JSON (flashcards_db.json) or SQLite (flashcards_db.sqlite3)
+- Export a chapter's flashcards to a plain text file, or the whole deck as text, CSV,
+  Anki TSV and JSON lines (optionally zipped into one archive)
+- Quiz mode to test yourself, or a quiz server that a whole class can connect to at once
+- Spaced-repetition review (SM-2) across all chapters, showing the cards that are due first
+- Bulk import of decks from CSV, TSV or JSON-lines files
+- Finds near-duplicate questions (MinHash + LSH) and can merge them
+- Keyword search over questions and answers (ranked with BM25), forgiving chapter names
 
 Usage:
 $ python biology_flashcards_generator.py
+$ python biology_flashcards_generator.py --backend sqlite
+$ python biology_flashcards_generator.py --migrate   # copy flashcards_db.json into SQLite
+$ python biology_flashcards_generator.py --backend sqlite --import cards.csv
+$ python biology_flashcards_generator.py --dedupe [--merge]
+$ python biology_flashcards_generator.py --export exports --archive deck.zip
+$ python biology_flashcards_generator.py --serve 8765       # then: nc localhost 8765
 
 Notes:
 - Uses a local JSON file (flashcards_db.json) in the same folder to persist user additions.
-- Safe for beginners: no external dependencies (works with Python 3.7+).
+  Only your own cards and edits are stored there; the built-in chapters are shared, read-only
+  data that is layered underneath when the deck is read.
+  Each add or edit is written straight away to flashcards_db.json.journal (one JSON line per
+  change) and folded back into flashcards_db.json in the background when the journal grows.
+- The SQLite backend writes each new card as one row, so large decks load and save quickly.
+  On first use it imports flashcards_db.json if that file exists.
+- The search index is saved next to the deck (e.g. flashcards_db.json.index) and only
+  rebuilt when it no longer matches the deck.
+- Review history is appended to flashcards_db.json.reviews, one line per answer.
+- Safe for beginners: no required dependencies (works with Python 3.7+). NumPy is optional;
+  when installed it speeds up finding near-duplicate cards.
 
 """
 
+import argparse
+import asyncio
+import bisect
+import csv
+import difflib
+import hashlib
+import heapq
 import json
+import math
+import operator
 import os
 import random
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
 import textwrap
-from typing import Dict, List, Tuple
+import threading
+import time
+import zipfile
+import zlib
+from array import array
+from collections import Counter, deque, namedtuple
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up --dedupe
+    np = None
 
 DB_FILENAME = "flashcards_db.json"
+SQLITE_FILENAME = "flashcards_db.sqlite3"
+BACKENDS = ("json", "sqlite")
+JOURNAL_SYNC_EVERY = 16            # fsync the journal after this many changes
+JOURNAL_COMPACT_BYTES = 1 << 20    # fold the journal into the deck once it is this big
+OVERLAY_FORMAT = "overlay-1"
+IMPORT_FORMATS = ("csv", "tsv", "jsonl")
+IMPORT_BATCH_SIZE = 10_000
+QUIZ_PORT = 8765
+QUIZ_IDLE_TIMEOUT = 300.0   # seconds a quiz connection may wait for input
+QUIZ_RATE_WINDOW = 60.0     # questions/s is measured over this many recent seconds
+QUIZ_BACKLOG = 1024         # pending connections, so a whole class can join at once
+EXPORT_FORMATS = ("txt", "csv", "anki", "jsonl")
+EXPORT_EXTENSIONS = {"txt": "_flashcards.txt", "csv": ".csv", "anki": ".tsv", "jsonl": ".jsonl"}
+DEDUPE_THRESHOLD = 0.7     # estimated Jaccard similarity of question shingles
+DEDUPE_BINS = 32           # MinHash signature length
+DEDUPE_BANDS = 8           # LSH bands (32 / 8 = 4 rows per band)
+DEDUPE_BUCKET_REPS = 8     # cards kept per LSH bucket for comparison
+DEDUPE_VERIFY_CHUNK = 1 << 15  # candidate pairs compared per NumPy step
 
 # --- Starter data ---
 DEFAULT_DB: Dict[str, List[Dict[str, str]]] = {
@@ -369,34 +436,499 @@ DEFAULT_DB: Dict[str, List[Dict[str, str]]] = {
     ]
 }
 
+# Frozen copy of the starter data shared by every deck: chapter -> tuple of (question, answer).
+BUILTIN_DECK: Mapping[str, Tuple[Tuple[str, str], ...]] = MappingProxyType({
+    chapter: tuple((fc["question"], fc["answer"]) for fc in cards) for chapter, cards in DEFAULT_DB.items()
+})
+
+# --- Deck layers ---
+
+class ChapterView(Sequence):
+    """Read-only list of one chapter's cards: built-in cards (with edits applied), then added ones.
+
+    Cards are merged on access, so indexing and len() are O(1) and nothing is copied.
+    """
+
+    __slots__ = ("_builtin", "_overlay")
+
+    def __init__(self, builtin: Tuple[Tuple[str, str], ...], overlay: Optional[Dict]):
+        self._builtin = builtin
+        self._overlay = overlay
+
+    def __len__(self) -> int:
+        return len(self._builtin) + (len(self._overlay["added"]) if self._overlay else 0)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("card index out of range")
+        if i < len(self._builtin):
+            edited = self._overlay["edited"].get(i) if self._overlay else None
+            if edited is not None:
+                return edited
+            question, answer = self._builtin[i]
+            return {"question": question, "answer": answer}
+        return self._overlay["added"][i - len(self._builtin)]
+
+
+class Deck(Mapping):
+    """A user's deck: the shared built-in cards plus a small overlay of this user's changes.
+
+    The overlay keeps, per chapter, the cards the user added and any built-in
+    cards they edited (by position). db[chapter] merges both layers lazily,
+    and to_json() holds only the overlay, which is what gets saved.
+    """
+
+    def __init__(self, overlay: Optional[Dict[str, Dict]] = None,
+                 builtin: Mapping[str, Tuple[Tuple[str, str], ...]] = BUILTIN_DECK):
+        self.builtin = builtin
+        self.overlay: Dict[str, Dict] = overlay if overlay is not None else {}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Deck":
+        """Read a saved overlay, or a full deck written by older versions (split into layers)."""
+        deck = cls()
+        if data.get("format") == OVERLAY_FORMAT:
+            for chapter, layer in data["chapters"].items():
+                deck.overlay[chapter] = {
+                    "added": list(layer.get("added", [])),
+                    "edited": {int(pos): fc for pos, fc in layer.get("edited", {}).items()},
+                    "replaces_builtin": bool(layer.get("replaces_builtin", False)),
+                }
+            return deck
+        for chapter, cards in data.items():
+            base = deck.builtin.get(chapter, ())
+            layer = deck._layer(chapter)
+            if len(cards) < len(base):
+                # Built-in cards were removed from this chapter: keep the user's list as it is.
+                layer["replaces_builtin"] = True
+                layer["added"] = list(cards)
+                continue
+            for pos, (question, answer) in enumerate(base):
+                if cards[pos]["question"] != question or cards[pos]["answer"] != answer:
+                    layer["edited"][pos] = cards[pos]
+            layer["added"] = list(cards[len(base):])
+        deck.overlay = {chapter: layer for chapter, layer in deck.overlay.items()
+                        if layer["added"] or layer["edited"] or layer["replaces_builtin"]
+                        or chapter not in deck.builtin}
+        return deck
+
+    def to_json(self) -> Dict:
+        """The overlay as JSON-ready data (lists and dicts are copied, cards are shared)."""
+        chapters = {}
+        for chapter, layer in self.overlay.items():
+            entry = {"added": list(layer["added"])}
+            if layer["edited"]:
+                entry["edited"] = {str(pos): fc for pos, fc in sorted(layer["edited"].items())}
+            if layer["replaces_builtin"]:
+                entry["replaces_builtin"] = True
+            chapters[chapter] = entry
+        return {"format": OVERLAY_FORMAT, "chapters": chapters}
+
+    def _layer(self, chapter: str) -> Dict:
+        if chapter not in self.overlay:
+            self.overlay[chapter] = {"added": [], "edited": {}, "replaces_builtin": False}
+        return self.overlay[chapter]
+
+    def _base(self, chapter: str) -> Tuple[Tuple[str, str], ...]:
+        layer = self.overlay.get(chapter)
+        if layer is not None and layer["replaces_builtin"]:
+            return ()
+        return self.builtin.get(chapter, ())
+
+    def __getitem__(self, chapter: str) -> ChapterView:
+        if chapter not in self.overlay and chapter not in self.builtin:
+            raise KeyError(chapter)
+        return ChapterView(self._base(chapter), self.overlay.get(chapter))
+
+    def __contains__(self, chapter: object) -> bool:
+        return chapter in self.overlay or chapter in self.builtin
+
+    def __iter__(self):
+        yield from self.builtin
+        yield from (chapter for chapter in self.overlay if chapter not in self.builtin)
+
+    def __len__(self) -> int:
+        return len(self.builtin) + sum(1 for chapter in self.overlay if chapter not in self.builtin)
+
+    def count(self, chapter: str) -> int:
+        return len(self[chapter]) if chapter in self else 0
+
+    def chapter_counts(self) -> Dict[str, int]:
+        return {chapter: self.count(chapter) for chapter in self}
+
+    def add_card(self, chapter: str, question: str, answer: str) -> None:
+        self._layer(chapter)["added"].append({"question": question, "answer": answer})
+
+    def edit_card(self, chapter: str, position: int, question: str, answer: str) -> None:
+        base = self._base(chapter)
+        layer = self._layer(chapter)
+        card = {"question": question, "answer": answer}
+        if position < len(base):
+            if base[position] == (question, answer):
+                layer["edited"].pop(position, None)
+            else:
+                layer["edited"][position] = card
+        else:
+            layer["added"][position - len(base)] = card
+
+    def remove_cards(self, chapter: str, positions: Iterable[int]) -> None:
+        positions = set(positions)
+        base = self._base(chapter)
+        if any(pos < len(base) for pos in positions):
+            # Built-in cards can't be dropped from the shared layer: keep this chapter's cards in the overlay.
+            remaining = [fc for pos, fc in enumerate(self[chapter]) if pos not in positions]
+            self.overlay[chapter] = {"added": remaining, "edited": {}, "replaces_builtin": True}
+        else:
+            layer = self._layer(chapter)
+            layer["added"] = [fc for i, fc in enumerate(layer["added"]) if i + len(base) not in positions]
+
+# --- SQLite storage ---
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chapters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    chapter_id INTEGER NOT NULL REFERENCES chapters(id),
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_by_chapter ON cards(chapter_id, id);
+"""
+
+
+class SQLiteDB(Mapping):
+    """Flashcard database kept in SQLite (chapters + cards tables).
+
+    Reads work like the JSON dict (db[chapter] is a list of cards, iterating
+    gives chapter names), but every lookup is an indexed query and add_card()
+    inserts and commits a single row instead of rewriting the whole deck.
+    """
+
+    def __init__(self, filename: str = SQLITE_FILENAME):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    def __getitem__(self, chapter: str) -> List[Dict[str, str]]:
+        row = self.conn.execute("SELECT id FROM chapters WHERE name = ?", (chapter,)).fetchone()
+        if row is None:
+            raise KeyError(chapter)
+        rows = self.conn.execute(
+            "SELECT question, answer FROM cards WHERE chapter_id = ? ORDER BY id", (row[0],))
+        return [{"question": q, "answer": a} for q, a in rows]
+
+    def __contains__(self, chapter: object) -> bool:
+        return self.conn.execute("SELECT 1 FROM chapters WHERE name = ?", (chapter,)).fetchone() is not None
+
+    def __iter__(self):
+        return (name for (name,) in self.conn.execute("SELECT name FROM chapters ORDER BY name"))
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM chapters").fetchone()[0]
+
+    def chapter_counts(self) -> Dict[str, int]:
+        """Number of cards in every chapter, in one grouped query."""
+        rows = self.conn.execute(
+            "SELECT chapters.name, COUNT(cards.id) FROM chapters "
+            "LEFT JOIN cards ON cards.chapter_id = chapters.id GROUP BY chapters.id")
+        return dict(rows)
+
+    def _chapter_id(self, chapter: str) -> int:
+        self.conn.execute("INSERT OR IGNORE INTO chapters (name) VALUES (?)", (chapter,))
+        return self.conn.execute("SELECT id FROM chapters WHERE name = ?", (chapter,)).fetchone()[0]
+
+    def add_card(self, chapter: str, question: str, answer: str) -> None:
+        with self.conn:
+            self.conn.execute("INSERT INTO cards (chapter_id, question, answer) VALUES (?, ?, ?)",
+                              (self._chapter_id(chapter), question, answer))
+
+    def add_many(self, db: Dict[str, List[Dict[str, str]]]) -> int:
+        """Insert a whole JSON-style deck in one transaction; returns the number of cards."""
+        count = 0
+        with self.conn:
+            for chapter, cards in db.items():
+                chapter_id = self._chapter_id(chapter)
+                self.conn.executemany(
+                    "INSERT INTO cards (chapter_id, question, answer) VALUES (?, ?, ?)",
+                    ((chapter_id, fc["question"], fc["answer"]) for fc in cards))
+                count += len(cards)
+        return count
+
+    def edit_card(self, chapter: str, position: int, question: str, answer: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE cards SET question = ?, answer = ? WHERE id = ("
+                "SELECT cards.id FROM cards JOIN chapters ON cards.chapter_id = chapters.id "
+                "WHERE chapters.name = ? ORDER BY cards.id LIMIT 1 OFFSET ?)",
+                (question, answer, chapter, position))
+
+    def add_cards(self, cards: Iterable[Tuple[str, str, str]]) -> None:
+        """Insert (chapter, question, answer) rows in a single transaction."""
+        chapter_ids: Dict[str, int] = {}
+        with self.conn:
+            rows = []
+            for chapter, question, answer in cards:
+                if chapter not in chapter_ids:
+                    chapter_ids[chapter] = self._chapter_id(chapter)
+                rows.append((chapter_ids[chapter], question, answer))
+            self.conn.executemany("INSERT INTO cards (chapter_id, question, answer) VALUES (?, ?, ?)", rows)
+
+    def remove_cards(self, chapter: str, positions: Iterable[int]) -> None:
+        positions = set(positions)
+        rows = self.conn.execute(
+            "SELECT cards.id FROM cards JOIN chapters ON cards.chapter_id = chapters.id "
+            "WHERE chapters.name = ? ORDER BY cards.id", (chapter,))
+        ids = [(card_id,) for pos, (card_id,) in enumerate(rows) if pos in positions]
+        with self.conn:
+            self.conn.executemany("DELETE FROM cards WHERE id = ?", ids)
+
+    def iter_cards(self, chapter: str) -> Iterator[Dict[str, str]]:
+        """Cards of a chapter read straight from the cursor, without building the list."""
+        rows = self.conn.execute(
+            "SELECT question, answer FROM cards JOIN chapters ON cards.chapter_id = chapters.id "
+            "WHERE chapters.name = ? ORDER BY cards.id", (chapter,))
+        return ({"question": q, "answer": a} for q, a in rows)
+
+    def count(self, chapter: str) -> int:
+        row = self.conn.execute(
+            "SELECT COUNT(cards.id) FROM chapters JOIN cards ON cards.chapter_id = chapters.id "
+            "WHERE chapters.name = ?", (chapter,)).fetchone()
+        return row[0]
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM cards LIMIT 1").fetchone() is None
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(json_filename: str = DB_FILENAME, sqlite_filename: str = SQLITE_FILENAME) -> int:
+    """One-time copy of a JSON deck into a new SQLite database; returns the number of cards."""
+    if os.path.exists(sqlite_filename):
+        raise FileExistsError(f"{sqlite_filename} already exists — not migrating over it.")
+    db = load_db(json_filename)
+    store = SQLiteDB(sqlite_filename)
+    try:
+        return store.add_many(db)
+    finally:
+        store.close()
+
+
+def json_filename_for(sqlite_filename: str) -> str:
+    """The JSON deck an SQLite database is migrated from: same name with a .json extension."""
+    return os.path.splitext(sqlite_filename)[0] + ".json"
+
+
+def open_sqlite_db(filename: str = SQLITE_FILENAME, json_filename: Optional[str] = None) -> SQLiteDB:
+    """Open the SQLite deck, filling a new database from the matching JSON deck (or defaults) first."""
+    if json_filename is None:
+        json_filename = json_filename_for(filename)
+    if not os.path.exists(filename):
+        if os.path.exists(json_filename):
+            count = migrate_json_to_sqlite(json_filename, filename)
+            print(f"Migrated {count} flashcards from {json_filename} to {filename}.")
+        else:
+            store = SQLiteDB(filename)
+            try:
+                store.add_many(DEFAULT_DB)
+            except BaseException:
+                store.close()
+                raise
+            return store
+    return SQLiteDB(filename)
+
 # --- File handling ---
 
-def load_db(filename: str = DB_FILENAME) -> Dict[str, List[Dict[str, str]]]:
-    """Load the flashcard database from JSON, or return defaults if file missing/corrupt."""
+def load_db(filename: Optional[str] = None, backend: str = "json"):
+    """Load the flashcard database.
+
+    backend="json" (default) reads a JSON file, or returns defaults if file missing/corrupt.
+    backend="sqlite" opens an SQLiteDB (created from the JSON deck on first use).
+    """
+    if backend == "sqlite":
+        return open_sqlite_db(filename or SQLITE_FILENAME)
+    if backend != "json":
+        raise ValueError(f"Unknown backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    if filename is None:
+        filename = DB_FILENAME
+    db = _load_json_db(filename)
+    journal = journal_filename(filename)
+    replay_journal(db, journal + ".old")
+    replay_journal(db, journal)
+    return db
+
+
+def _load_json_db(filename: str) -> Deck:
     if not os.path.exists(filename):
-        return DEFAULT_DB.copy()
+        return Deck()
     try:
         with open(filename, "r", encoding="utf-8") as f:
             data = json.load(f)
         # Ensure proper structure
         if isinstance(data, dict):
-            return data
+            return Deck.from_json(data)
         else:
             print("Warning: DB file malformed — using defaults.")
-            return DEFAULT_DB.copy()
+            return Deck()
     except Exception as e:
         print(f"Error loading DB: {e}\nUsing default data.")
-        return DEFAULT_DB.copy()
+        return Deck()
+
+
+def write_json_db(db: Dict[str, List[Dict[str, str]]], filename: str) -> None:
+    """Write the deck to a temporary file and swap it in, so a crash never leaves half a file.
+
+    A Deck is written as its overlay only; a plain dict is written as it is.
+    """
+    data = db.to_json() if isinstance(db, Deck) else db
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
 
 
 def save_db(db: Dict[str, List[Dict[str, str]]], filename: str = DB_FILENAME) -> None:
-    """Save the flashcard database to JSON."""
+    """Save the flashcard database to JSON (an SQLiteDB is already saved; it just commits)."""
+    if isinstance(db, SQLiteDB):
+        db.commit()
+        return
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(db, f, indent=2, ensure_ascii=False)
+        write_json_db(db, filename)
     except Exception as e:
         print(f"Error saving DB: {e}")
 
+# --- Journal ---
+
+def journal_filename(db_filename: str) -> str:
+    return db_filename + ".journal"
+
+
+def apply_change(db: Dict[str, List[Dict[str, str]]], change: Dict) -> None:
+    """Apply one journal entry to a JSON deck.
+
+    Entries name the card position they write, so replaying a change that is
+    already part of the deck file (e.g. after a crash during compaction) is a no-op.
+    """
+    chapter, position = change["chapter"], change["position"]
+    if isinstance(db, Deck):
+        size = db.count(chapter)
+        if change["op"] == "add" and position == size:
+            db.add_card(chapter, change["question"], change["answer"])
+        elif change["op"] == "edit" and position < size:
+            db.edit_card(chapter, position, change["question"], change["answer"])
+        return
+    card = {"question": change["question"], "answer": change["answer"]}
+    cards = db.setdefault(chapter, [])
+    if change["op"] == "add":
+        if position == len(cards):
+            cards.append(card)
+    elif change["op"] == "edit":
+        if position < len(cards):
+            cards[position] = card
+
+
+def replay_journal(db: Dict[str, List[Dict[str, str]]], filename: str) -> int:
+    """Apply every complete entry of a journal file to db; returns how many were read."""
+    if not os.path.exists(filename):
+        return 0
+    count = 0
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                apply_change(db, json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue  # a line cut short by a crash
+            count += 1
+    return count
+
+
+class Journal:
+    """Write-ahead log of changes to a JSON deck.
+
+    Every change is appended as one JSON line and flushed; fsync runs once per
+    JOURNAL_SYNC_EVERY changes and on sync()/close(). When the journal passes
+    JOURNAL_COMPACT_BYTES it is renamed to <journal>.old and a background thread
+    writes a snapshot of the deck over the deck file, then deletes the old journal.
+    """
+
+    def __init__(self, db: Dict[str, List[Dict[str, str]]], filename: str = DB_FILENAME,
+                 sync_every: int = JOURNAL_SYNC_EVERY, compact_bytes: int = JOURNAL_COMPACT_BYTES):
+        self.db = db
+        self.filename = filename
+        self.path = journal_filename(filename)
+        self.sync_every = sync_every
+        self.compact_bytes = compact_bytes
+        self._pending = 0
+        self._compactor: Optional[threading.Thread] = None
+        if not os.path.exists(filename):
+            write_json_db(db, filename)
+        if os.path.exists(self.path + ".old"):
+            # A compaction was interrupted; db already holds both journals.
+            write_json_db(db, filename)
+            os.remove(self.path + ".old")
+            open(self.path, "w").close()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, change: Dict) -> None:
+        self._file.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+        if self._file.tell() >= self.compact_bytes:
+            self.compact()
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def compact(self) -> bool:
+        """Start folding the journal into the deck file; False if a compaction is still running."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return False
+        self.sync()
+        self._file.close()
+        old = self.path + ".old"
+        os.replace(self.path, old)
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Cards are replaced, never changed in place, so copying the lists is a stable snapshot.
+        if isinstance(self.db, Deck):
+            snapshot = self.db.to_json()
+        else:
+            snapshot = {chapter: list(cards) for chapter, cards in self.db.items()}
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot, old))
+        self._compactor.start()
+        return True
+
+    def _write_snapshot(self, snapshot: Dict[str, List[Dict[str, str]]], old: str) -> None:
+        try:
+            write_json_db(snapshot, self.filename)
+            os.remove(old)
+        except OSError as e:
+            print(f"Error compacting journal: {e}")
+
+    def close(self) -> None:
+        self.sync()
+        self._file.close()
+        if self._compactor is not None:
+            self._compactor.join()
+
 # --- Flashcard operations ---
 
 def list_chapters(db: Dict[str, List[Dict[str, str]]]) -> List[str]:
@@ -407,10 +939,60 @@ def get_flashcards(db: Dict[str, List[Dict[str, str]]], chapter: str) -> List[Di
     return db.get(chapter, [])
 
 
-def add_flashcard(db: Dict[str, List[Dict[str, str]]], chapter: str, question: str, answer: str) -> None:
-    if chapter not in db:
-        db[chapter] = []
-    db[chapter].append({"question": question.strip(), "answer": answer.strip()})
+def chapter_counts(db: Dict[str, List[Dict[str, str]]]) -> Dict[str, int]:
+    if isinstance(db, (SQLiteDB, Deck)):
+        return db.chapter_counts()
+    return {chapter: len(cards) for chapter, cards in db.items()}
+
+
+def add_flashcard(db: Dict[str, List[Dict[str, str]]], chapter: str, question: str, answer: str,
+                  index: Optional["SearchIndex"] = None, journal: Optional[Journal] = None) -> None:
+    """Add a card to a chapter; a given search index and journal are updated too."""
+    question, answer = question.strip(), answer.strip()
+    if isinstance(db, SQLiteDB):
+        db.add_card(chapter, question, answer)
+        position = db.count(chapter) - 1
+    else:
+        if isinstance(db, Deck):
+            db.add_card(chapter, question, answer)
+        else:
+            db.setdefault(chapter, []).append({"question": question, "answer": answer})
+        position = len(db[chapter]) - 1
+        if journal is not None:
+            journal.append({"op": "add", "chapter": chapter, "position": position,
+                            "question": question, "answer": answer})
+    if index is not None:
+        index.add(chapter, position, question, answer)
+
+
+def edit_flashcard(db: Dict[str, List[Dict[str, str]]], chapter: str, position: int, question: str,
+                   answer: str, index: Optional["SearchIndex"] = None,
+                   journal: Optional[Journal] = None) -> Dict[str, str]:
+    """Replace the card at a position (0-based) in a chapter; returns the old card."""
+    question, answer = question.strip(), answer.strip()
+    old = get_flashcards(db, chapter)[position]
+    if isinstance(db, SQLiteDB):
+        db.edit_card(chapter, position, question, answer)
+    else:
+        if isinstance(db, Deck):
+            db.edit_card(chapter, position, question, answer)
+        else:
+            db[chapter][position] = {"question": question, "answer": answer}
+        if journal is not None:
+            journal.append({"op": "edit", "chapter": chapter, "position": position,
+                            "question": question, "answer": answer})
+    if index is not None:
+        index.replace(chapter, position, old["question"], old["answer"], question, answer)
+    return old
+
+
+def remove_flashcards(db: Dict[str, List[Dict[str, str]]], chapter: str, positions: Iterable[int]) -> None:
+    """Delete cards by position (0-based). Later cards move up, so a JSON deck must be saved in full afterwards."""
+    if isinstance(db, (SQLiteDB, Deck)):
+        db.remove_cards(chapter, positions)
+    else:
+        positions = set(positions)
+        db[chapter] = [fc for pos, fc in enumerate(db[chapter]) if pos not in positions]
 
 
 def export_to_text(flashcards: List[Dict[str, str]], chapter: str, filename: str = None) -> str:
@@ -418,12 +1000,591 @@ def export_to_text(flashcards: List[Dict[str, str]], chapter: str, filename: str
         safe_name = chapter.replace(" ", "_")
         filename = f"{safe_name}_flashcards.txt"
     with open(filename, "w", encoding="utf-8") as f:
+        write_cards(f, chapter, flashcards, "txt")
+    return filename
+
+
+def write_cards(f, chapter: str, flashcards: Iterable[Dict[str, str]], fmt: str = "txt") -> None:
+    """Write one chapter's cards to an open file, a card at a time.
+
+    "txt" is the readable Q/A layout, "csv" and "jsonl" have chapter, question
+    and answer (the same columns --import reads), and "anki" is a tab-separated
+    file with the chapter as a tag, ready for Anki's File > Import.
+    """
+    if fmt == "txt":
         f.write(f"Flashcards — {chapter}\n")
         f.write("=" * (len(chapter) + 13) + "\n\n")
         for i, fc in enumerate(flashcards, 1):
             f.write(f"Q{i}: {fc['question']}\n")
             f.write(f"A{i}: {fc['answer']}\n\n")
-    return filename
+    elif fmt == "csv":
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(("chapter", "question", "answer"))
+        for fc in flashcards:
+            writer.writerow((chapter, fc["question"], fc["answer"]))
+    elif fmt == "anki":
+        f.write("#separator:tab\n#html:false\n#tags column:3\n")
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        tag = re.sub(r"\s+", "_", chapter.strip())
+        for fc in flashcards:
+            writer.writerow((fc["question"], fc["answer"], tag))
+    elif fmt == "jsonl":
+        for fc in flashcards:
+            f.write(json.dumps({"chapter": chapter, "question": fc["question"], "answer": fc["answer"]},
+                               ensure_ascii=False) + "\n")
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(EXPORT_FORMATS)}")
+
+
+def _export_chapter(db, chapter: str, fmt: str, path: str) -> int:
+    newline = "" if fmt in ("csv", "anki") else None
+    if isinstance(db, SQLiteDB):
+        # SQLite connections can't be shared between threads; each job reads through its own.
+        store = SQLiteDB(db.filename)
+        try:
+            with open(path, "w", encoding="utf-8", newline=newline) as f:
+                write_cards(f, chapter, store.iter_cards(chapter), fmt)
+        finally:
+            store.close()
+    else:
+        with open(path, "w", encoding="utf-8", newline=newline) as f:
+            write_cards(f, chapter, db[chapter], fmt)
+    return os.path.getsize(path)
+
+
+def export_deck(db: Dict[str, List[Dict[str, str]]], out_dir: str, formats: Iterable[str] = EXPORT_FORMATS,
+                workers: int = 4, archive: Optional[str] = None) -> Tuple[int, int, float]:
+    """Export every chapter in every format, one file per chapter under out_dir/<format>/.
+
+    Files are written in parallel by a thread pool. With archive, the files are
+    also packed into that zip file. Returns (files, bytes written, seconds); the
+    bytes count the exported files only, not the archive made from them.
+    """
+    start = time.perf_counter()
+    jobs = []
+    for fmt in formats:
+        os.makedirs(os.path.join(out_dir, fmt), exist_ok=True)
+        used = set()
+        for chapter in db:
+            name = re.sub(r"[^\w.-]+", "_", chapter).strip("_") or "chapter"
+            while name.lower() in used:
+                name += "_"
+            used.add(name.lower())
+            jobs.append((chapter, fmt, os.path.join(out_dir, fmt, name + EXPORT_EXTENSIONS[fmt])))
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        sizes = list(pool.map(lambda job: _export_chapter(db, *job), jobs))
+    total = sum(sizes)
+    if archive:
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for _, _, path in jobs:
+                zf.write(path, os.path.relpath(path, out_dir))
+    return len(jobs), total, time.perf_counter() - start
+
+# --- Bulk import ---
+
+ImportResult = namedtuple("ImportResult", "rows added duplicates invalid seconds")
+
+
+def detect_import_format(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".tsv", ".tab"):
+        return "tsv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def read_import_rows(filename: str, fmt: Optional[str] = None) -> Iterator[Optional[Tuple[str, str, str]]]:
+    """Stream (chapter, question, answer) rows from a CSV, TSV or JSON-lines file.
+
+    CSV/TSV files may start with a header naming the chapter, question and
+    answer columns (in any order); otherwise the first three columns are used.
+    Rows that cannot be read yield None so they can be counted as invalid.
+    """
+    fmt = fmt or detect_import_format(filename)
+    with open(filename, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "jsonl":
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    yield row["chapter"], row["question"], row["answer"]
+                except (ValueError, KeyError, TypeError):
+                    yield None
+            return
+        reader = csv.reader(f, delimiter="\t" if fmt == "tsv" else ",")
+        columns = (0, 1, 2)
+        for row in reader:
+            header = [c.strip().lower() for c in row]
+            if reader.line_num == 1 and {"chapter", "question", "answer"} <= set(header):
+                columns = tuple(header.index(name) for name in ("chapter", "question", "answer"))
+                continue
+            if not row:
+                continue
+            try:
+                yield tuple(row[i] for i in columns)
+            except IndexError:
+                yield None
+
+
+def card_digest(chapter: str, question: str, answer: str) -> int:
+    """64-bit fingerprint of a card, so the duplicate set stores small ints instead of the text."""
+    data = "\x1f".join((chapter, question, answer)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def import_cards(db: Dict[str, List[Dict[str, str]]], rows: Iterable[Optional[Tuple[str, str, str]]],
+                 batch_size: int = IMPORT_BATCH_SIZE, progress: bool = True) -> ImportResult:
+    """Add streamed rows to the deck in batches, skipping exact duplicates and incomplete rows.
+
+    Fields are stripped like add_flashcard does. Cards already in the deck
+    count as duplicates too. Only one batch of rows is held at a time; the
+    duplicate set keeps an 8-byte fingerprint per distinct card.
+    """
+    seen = set()
+    for chapter in db:
+        for fc in db[chapter]:
+            seen.add(card_digest(chapter, fc["question"], fc["answer"]))
+    start = time.perf_counter()
+    n_rows = added = duplicates = invalid = 0
+    batch: List[Tuple[str, str, str]] = []
+
+    def flush() -> None:
+        if isinstance(db, SQLiteDB):
+            db.add_cards(batch)
+        else:
+            for chapter, question, answer in batch:
+                add_flashcard(db, chapter, question, answer)
+        batch.clear()
+        if progress:
+            rate = n_rows / max(time.perf_counter() - start, 1e-9)
+            print(f"\rImported {added:,} cards from {n_rows:,} rows ({rate:,.0f} rows/s)", end="", flush=True)
+
+    for row in rows:
+        n_rows += 1
+        if row is None:
+            invalid += 1
+            continue
+        chapter, question, answer = (str(field).strip() for field in row)
+        if not (chapter and question and answer):
+            invalid += 1
+            continue
+        digest = card_digest(chapter, question, answer)
+        if digest in seen:
+            duplicates += 1
+            continue
+        seen.add(digest)
+        batch.append((chapter, question, answer))
+        added += 1
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    if progress:
+        print()
+    return ImportResult(n_rows, added, duplicates, invalid, time.perf_counter() - start)
+
+# --- Search ---
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by does do for from how in is it of on or the this to what which who why with".split())
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index over card questions and answers, ranked with BM25.
+
+    Each card is a document identified by (chapter, position in chapter).
+    Postings map a term to {doc id: term frequency}, so a query only touches
+    the cards that contain its terms. A query term ending in "*" matches
+    every indexed term with that prefix.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.docs: List[Tuple[str, int]] = []
+        self.lengths: List[int] = []
+        self.total_length = 0
+        self.counts: Dict[str, int] = {}
+        self.fingerprint: Optional[str] = None
+        self._sorted_terms: Optional[List[str]] = None
+        self._doc_ids: Optional[Dict[Tuple[str, int], int]] = None
+
+    @classmethod
+    def build(cls, db: Dict[str, List[Dict[str, str]]]) -> "SearchIndex":
+        index = cls()
+        for chapter in db:
+            for position, fc in enumerate(db[chapter]):
+                index.add(chapter, position, fc["question"], fc["answer"])
+        return index
+
+    def add(self, chapter: str, position: int, question: str, answer: str) -> None:
+        doc = len(self.docs)
+        self.docs.append((chapter, position))
+        self.lengths.append(0)
+        self.counts[chapter] = self.counts.get(chapter, 0) + 1
+        if self._doc_ids is not None:
+            self._doc_ids[(chapter, position)] = doc
+        self._index_terms(doc, question, answer)
+
+    def _index_terms(self, doc: int, question: str, answer: str) -> None:
+        terms = tokenize(question) + tokenize(answer)
+        self.lengths[doc] = len(terms)
+        self.total_length += len(terms)
+        for term, tf in Counter(terms).items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                self._sorted_terms = None
+            self.postings[term][doc] = tf
+
+    def replace(self, chapter: str, position: int, old_question: str, old_answer: str,
+                question: str, answer: str) -> None:
+        """Re-index an edited card, dropping the postings of its old text."""
+        if self._doc_ids is None:
+            self._doc_ids = {key: doc for doc, key in enumerate(self.docs)}
+        doc = self._doc_ids.get((chapter, position))
+        if doc is None:
+            self.add(chapter, position, question, answer)
+            return
+        for term in set(tokenize(old_question) + tokenize(old_answer)):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc, None)
+                if not docs:
+                    del self.postings[term]
+                    self._sorted_terms = None
+        self.total_length -= self.lengths[doc]
+        self._index_terms(doc, question, answer)
+
+    def _expand(self, term: str) -> List[str]:
+        if not term.endswith("*"):
+            return [term] if term in self.postings else []
+        prefix = term[:-1]
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = []
+        i = bisect.bisect_left(self._sorted_terms, prefix)
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(prefix):
+            terms.append(self._sorted_terms[i])
+            i += 1
+        return terms
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, str, int]]:
+        """Best matches as (score, chapter, position), highest score first."""
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[int, float] = {}
+        for word in query.split():
+            for token in tokenize(word):
+                for term in self._expand(token + "*" if word.endswith("*") else token):
+                    docs = self.postings[term]
+                    idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for doc, tf in docs.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / avg_length)
+                        scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, *self.docs[doc]) for doc, score in best]
+
+    def save(self, filename: str, fingerprint: Optional[str] = None) -> None:
+        """Write the index; fingerprint (see deck_fingerprint) records which deck content it covers."""
+        self.fingerprint = fingerprint
+        data = {
+            "version": 2,
+            "fingerprint": fingerprint,
+            "counts": self.counts,
+            "docs": self.docs,
+            "lengths": self.lengths,
+            "postings": {term: list(docs.items()) for term, docs in self.postings.items()},
+        }
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        except OSError as e:
+            print(f"Error saving search index: {e}")
+
+    @classmethod
+    def load(cls, filename: str) -> "SearchIndex":
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != 2:
+            raise ValueError("unsupported search index version")
+        index = cls()
+        index.fingerprint = data["fingerprint"]
+        index.counts = data["counts"]
+        index.docs = [tuple(doc) for doc in data["docs"]]
+        index.lengths = data["lengths"]
+        index.total_length = sum(index.lengths)
+        index.postings = {term: dict(docs) for term, docs in data["postings"].items()}
+        return index
+
+
+def index_filename(db_filename: str) -> str:
+    return db_filename + ".index"
+
+
+def deck_fingerprint(db: Dict[str, List[Dict[str, str]]]) -> str:
+    """Hash of every chapter, question and answer in position order.
+
+    Any edit, or an add and delete that leave the card counts unchanged, gives a
+    different fingerprint, so a saved search index can tell it is stale.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for chapter in sorted(chapter_counts(db)):
+        h.update(chapter.encode("utf-8") + b"\x1d")
+        h.update("\x1e".join(fc["question"] + "\x1f" + fc["answer"]
+                             for fc in get_flashcards(db, chapter)).encode("utf-8") + b"\x1d")
+    return h.hexdigest()
+
+
+def load_index(db: Dict[str, List[Dict[str, str]]], filename: str) -> SearchIndex:
+    """Load the saved index if it was built from the deck's current content, else rebuild and save it."""
+    fingerprint = deck_fingerprint(db)
+    if os.path.exists(filename):
+        try:
+            index = SearchIndex.load(filename)
+            if index.fingerprint == fingerprint:
+                return index
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    index = SearchIndex.build(db)
+    index.save(filename, fingerprint)
+    return index
+
+
+def search_flashcards(db: Dict[str, List[Dict[str, str]]], index: SearchIndex, query: str,
+                      limit: int = 10) -> List[Tuple[float, str, Dict[str, str]]]:
+    """Ranked cards for a keyword query as (score, chapter, card)."""
+    results = []
+    chapters: Dict[str, List[Dict[str, str]]] = {}
+    for score, chapter, position in index.search(query, limit):
+        if chapter not in chapters:
+            chapters[chapter] = get_flashcards(db, chapter)
+        if position < len(chapters[chapter]):
+            results.append((score, chapter, chapters[chapter][position]))
+    return results
+
+
+def find_chapters(db: Dict[str, List[Dict[str, str]]], name: str, limit: int = 5) -> List[str]:
+    """Chapters matching a name: exact (any case) first, then prefix matches, then close spellings."""
+    chapters = list_chapters(db)
+    lowered = {c.lower(): c for c in chapters}
+    key = name.strip().lower()
+    if key in lowered:
+        return [lowered[key]]
+    matches = [c for c in chapters if c.lower().startswith(key)]
+    if not matches:
+        matches = [lowered[m] for m in difflib.get_close_matches(key, list(lowered), n=limit, cutoff=0.6)]
+    return matches[:limit]
+
+
+def resolve_chapter(db: Dict[str, List[Dict[str, str]]], name: str) -> str:
+    """Chapter name to use for user input: the input itself if it exists, else the best match."""
+    if name in db:
+        return name
+    matches = find_chapters(db, name)
+    if matches:
+        print(f"Using chapter '{matches[0]}'" +
+              (f" (other matches: {', '.join(matches[1:])})" if len(matches) > 1 else ""))
+        return matches[0]
+    return name
+
+# --- Near-duplicates ---
+
+# Words that only say "this is a question"; "Define photosynthesis" and
+# "What is photosynthesis?" should both reduce to "photosynthesis".
+QUESTION_WORDS = frozenset(
+    "define definition describe explain give list mean meant name state term".split())
+_MASK64 = (1 << 64) - 1
+_DENSIFY_STEP = 0x9E3779B97F4A7C15  # odd constant that marks values borrowed from another bin
+
+
+def question_shingles(question: str, k: int = 4) -> set:
+    """Hashed character k-grams of a question with stopwords and question words removed."""
+    text = " ".join(t for t in tokenize(question) if t not in QUESTION_WORDS)
+    if not text:
+        return set()
+    data = text.encode("utf-8")
+    if len(data) <= k:
+        return {zlib.crc32(data)}
+    return {zlib.crc32(data[i:i + k]) for i in range(len(data) - k + 1)}
+
+
+class MinHasher:
+    """MinHash signatures by one-permutation hashing with rotation densification.
+
+    Each shingle is hashed once; the hash picks one of `bins` bins and the
+    smallest value per bin is kept. An empty bin borrows the value of the next
+    non-empty bin to its right, shifted by a multiple of the distance. Two signatures agree
+    in a position with probability equal to the Jaccard similarity of the
+    shingle sets, like classic MinHash with `bins` permutations, but the cost
+    is one hash per shingle instead of one per shingle and permutation.
+    """
+
+    def __init__(self, bins: int = DEDUPE_BINS, seed: int = 1):
+        rng = random.Random(seed)
+        self.bins = bins
+        self.a = rng.getrandbits(64) | 1
+        self.b = rng.getrandbits(64)
+
+    def signature(self, shingles: set) -> Tuple[int, ...]:
+        n, a, b = self.bins, self.a, self.b
+        mins: List[Optional[int]] = [None] * n
+        for x in shingles:
+            h = (a * x + b) & _MASK64
+            i, value = h % n, h // n
+            if mins[i] is None or value < mins[i]:
+                mins[i] = value
+        signature = []
+        for i in range(n):
+            distance, value = 0, mins[i]
+            while value is None:
+                distance += 1
+                value = mins[(i + distance) % n]
+            signature.append((value + distance * _DENSIFY_STEP) & _MASK64)
+        return tuple(signature)
+
+
+def signature_similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the share of MinHash positions that agree."""
+    return sum(map(operator.eq, sig1, sig2)) / len(sig1)
+
+
+def _similar_pairs(signatures: array, bins: int, bands: int,
+                   threshold: float) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """(i, j) arrays of cards that share an LSH bucket and are at least threshold similar.
+
+    For each band the cards are sorted by that band's values, so every bucket is
+    a run; each card is paired with the DEDUPE_BUCKET_REPS cards before it in its
+    run, and the pairs' full signatures are compared a chunk at a time. Only the
+    low 16 bits of each value are compared, which keeps the comparison cheap and
+    makes a chance match between different values 1 in 65536.
+    """
+    sigs = np.frombuffer(signatures, dtype=np.uint64).reshape(-1, bins)
+    compact = sigs.astype(np.uint16)
+    rows = bins // bands
+    for band in range(bands):
+        keys = sigs[:, band * rows:(band + 1) * rows]
+        order = np.lexsort(keys.T[::-1])
+        keys = keys[order]
+        for distance in range(1, min(DEDUPE_BUCKET_REPS, len(order) - 1) + 1):
+            same = np.flatnonzero((keys[distance:] == keys[:-distance]).all(axis=1))
+            if not len(same):
+                break  # no bucket holds more than `distance` cards
+            for start in range(0, len(same), DEDUPE_VERIFY_CHUNK):
+                chunk = same[start:start + DEDUPE_VERIFY_CHUNK]
+                i, j = order[chunk], order[chunk + distance]
+                similar = (compact[i] == compact[j]).sum(axis=1) / bins >= threshold
+                yield i[similar], j[similar]
+
+
+def find_duplicate_clusters(db: Dict[str, List[Dict[str, str]]], threshold: float = DEDUPE_THRESHOLD,
+                            bins: int = DEDUPE_BINS, bands: int = DEDUPE_BANDS) -> List[List[Tuple[float, str, int]]]:
+    """Groups of cards with near-identical questions, as lists of (similarity, chapter, position).
+
+    Each question gets a MinHash signature; the signature is cut into bands and
+    cards sharing any band land in the same bucket, so only cards in a shared
+    bucket are compared (close to linear time instead of all pairs). Within a
+    bucket a card is compared against at most DEDUPE_BUCKET_REPS others, so
+    crowded buckets stay cheap: the cards just before it in the bucket, checked
+    in bulk with NumPy when it is installed, or else the bucket's most recent
+    representatives. Cards at or above the threshold are joined with union-find.
+    Similarity is measured against the first card of each cluster.
+    """
+    hasher = MinHasher(bins)
+    rows = bins // bands
+    cards: List[Tuple[str, int]] = []
+    signatures = array("Q")  # bins values per card, back to back
+    for chapter in db:
+        for position, fc in enumerate(db[chapter]):
+            shingles = question_shingles(fc["question"])
+            if shingles:
+                cards.append((chapter, position))
+                signatures.extend(hasher.signature(shingles))
+    parent = list(range(len(cards)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def similarity(i: int, j: int) -> float:
+        return signature_similarity(signatures[i * bins:(i + 1) * bins], signatures[j * bins:(j + 1) * bins])
+
+    if np is not None:
+        for first, second in _similar_pairs(signatures, bins, bands, threshold):
+            for i, j in zip(first.tolist(), second.tolist()):
+                parent[find(i)] = find(j)
+    else:
+        # One band at a time, so only one band's buckets are in memory.
+        for band in range(bands):
+            buckets: Dict[int, List[int]] = {}
+            for card in range(len(cards)):
+                offset = card * bins + band * rows
+                key = hash(tuple(signatures[offset:offset + rows]))
+                reps = buckets.get(key)
+                if reps is None:
+                    buckets[key] = [card]
+                    continue
+                for rep_card in reversed(reps):
+                    if find(rep_card) == find(card):
+                        break
+                    if similarity(card, rep_card) >= threshold:
+                        parent[find(card)] = find(rep_card)
+                        break
+                else:
+                    reps.append(card)
+                    if len(reps) > DEDUPE_BUCKET_REPS:
+                        del reps[0]
+
+    groups: Dict[int, List[int]] = {}
+    for card in range(len(cards)):
+        groups.setdefault(find(card), []).append(card)
+    clusters = []
+    for members in groups.values():
+        if len(members) > 1:
+            clusters.append([(similarity(members[0], m), *cards[m]) for m in members])
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def merge_duplicates(db: Dict[str, List[Dict[str, str]]], clusters: List[List[Tuple[float, str, int]]]) -> int:
+    """Keep the card with the longest answer in each cluster and delete the rest; returns cards removed."""
+    doomed: Dict[str, List[int]] = {}
+    chapters: Dict[str, List[Dict[str, str]]] = {}
+    for cluster in clusters:
+        for _, chapter, _ in cluster:
+            if chapter not in chapters:
+                chapters[chapter] = get_flashcards(db, chapter)
+        chosen = [(chapter, pos, chapters[chapter][pos]) for _, chapter, pos in cluster]
+        keep = max(chosen, key=lambda item: len(item[2]["answer"]))
+        for chapter, pos, _ in chosen:
+            if (chapter, pos) != keep[:2]:
+                doomed.setdefault(chapter, []).append(pos)
+    for chapter, positions in doomed.items():
+        remove_flashcards(db, chapter, positions)
+    return sum(len(positions) for positions in doomed.values())
+
+
+def print_duplicate_clusters(db: Dict[str, List[Dict[str, str]]], clusters: List[List[Tuple[float, str, int]]],
+                             limit: int = 20) -> None:
+    chapters: Dict[str, List[Dict[str, str]]] = {}
+    for i, cluster in enumerate(clusters[:limit], 1):
+        print(f"\nCluster {i} ({len(cluster)} cards):")
+        for similarity, chapter, position in cluster:
+            if chapter not in chapters:
+                chapters[chapter] = get_flashcards(db, chapter)
+            print(f"  {similarity:.2f}  [{chapter}] {chapters[chapter][position]['question']}")
+    if len(clusters) > limit:
+        print(f"\n... and {len(clusters) - limit} more clusters.")
 
 # --- Generator ---
 
@@ -432,7 +1593,7 @@ def generate_flashcards_for_chapter(db: Dict[str, List[Dict[str, str]]], chapter
     if not pool:
         return []
     if n is None or n >= len(pool):
-        return pool.copy()
+        return list(pool)
     return random.sample(pool, n)
 
 # --- Quiz mode ---
@@ -442,7 +1603,7 @@ def quiz_user(flashcards: List[Dict[str, str]], rounds: int = 5) -> None:
         print("No flashcards to quiz on.")
         return
     rounds = min(rounds, len(flashcards))
-    pool = flashcards.copy()
+    pool = list(flashcards)
     random.shuffle(pool)
     score = 0
     for i in range(rounds):
@@ -455,6 +1616,338 @@ def quiz_user(flashcards: List[Dict[str, str]], rounds: int = 5) -> None:
             score += 1
     print(f"\nQuiz finished — Score: {score}/{rounds}")
 
+# --- Quiz server ---
+
+class QuizSession:
+    """State of one connected student."""
+
+    __slots__ = ("chapter", "score", "asked", "last_received")
+
+    def __init__(self):
+        self.chapter: Optional[str] = None
+        self.score = 0
+        self.asked = 0
+        self.last_received: Optional[float] = None
+
+
+class QuizServer:
+    """Runs many quiz sessions at once over a line-based socket protocol.
+
+    All sessions read the same deck, loaded once and never changed; each
+    connection gets its own QuizSession. A client types a chapter name (or
+    LIST / QUIT), then answers like in quiz mode. Sending STATS as a line
+    returns a JSON object with session counts, questions/s and response
+    latency percentiles, then closes the connection. Connections idle for
+    longer than idle_timeout seconds are closed.
+    """
+
+    def __init__(self, db: Dict[str, List[Dict[str, str]]], rounds: int = 5,
+                 idle_timeout: float = QUIZ_IDLE_TIMEOUT):
+        self.db = db
+        self.rounds = rounds
+        self.idle_timeout = idle_timeout
+        self.started = time.monotonic()
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.timed_out = 0
+        self.questions = 0
+        self.recent_questions = deque()            # monotonic times of recent questions
+        self.latencies = deque(maxlen=10_000)      # seconds from a client's line to our full reply
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        while self.recent_questions and self.recent_questions[0] < now - QUIZ_RATE_WINDOW:
+            self.recent_questions.popleft()
+        window = min(QUIZ_RATE_WINDOW, now - self.started) or 1.0
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 3)
+
+        return {
+            "active_sessions": self.active_sessions,
+            "total_sessions": self.total_sessions,
+            "timed_out_sessions": self.timed_out,
+            "questions": self.questions,
+            "questions_per_second": round(len(self.recent_questions) / window, 3),
+            "latency_ms": {"p50": percentile(50), "p90": percentile(90), "p99": percentile(99)},
+            "uptime_seconds": round(now - self.started, 1),
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.active_sessions += 1
+        self.total_sessions += 1
+        try:
+            await self._run_session(QuizSession(), reader, writer)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            try:
+                await self._send(writer, "\nNo answer for a while — closing the quiz. Bye!\n")
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _send(self, writer: asyncio.StreamWriter, text: str) -> None:
+        writer.write(text.encode("utf-8"))
+        await writer.drain()
+
+    async def _ask(self, session: QuizSession, reader: asyncio.StreamReader,
+                   writer: asyncio.StreamWriter, prompt: str) -> Optional[str]:
+        """Send a prompt and wait for the reply line; None when the client hung up."""
+        await self._send(writer, prompt)
+        if session.last_received is not None:
+            self.latencies.append(time.monotonic() - session.last_received)
+        line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        session.last_received = time.monotonic()
+        if not line:
+            return None
+        return line.decode("utf-8", errors="replace").strip()
+
+    async def _run_session(self, session: QuizSession, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        await self._send(writer, "=== Biology Flashcards Quiz ===\n"
+                                 "Type a chapter name to start, LIST to see the chapters, or QUIT.\n")
+        while True:
+            line = await self._ask(session, reader, writer, "\nChapter> ")
+            if line is None or line.upper() == "QUIT":
+                await self._send(writer, "Goodbye!\n")
+                return
+            if line.upper() == "STATS":
+                await self._send(writer, json.dumps(self.stats()) + "\n")
+                return
+            if line.upper() == "LIST" or not line:
+                counts = chapter_counts(self.db)
+                await self._send(writer, "".join(f" - {c} ({counts.get(c, 0)} cards)\n"
+                                                 for c in list_chapters(self.db)))
+                continue
+            matches = find_chapters(self.db, line)
+            if not matches:
+                await self._send(writer, f"No chapter matches '{line}'. Type LIST to see them.\n")
+                continue
+            session.chapter = matches[0]
+            if not await self._quiz(session, reader, writer):
+                return
+
+    async def _quiz(self, session: QuizSession, reader: asyncio.StreamReader,
+                    writer: asyncio.StreamWriter) -> bool:
+        cards = get_flashcards(self.db, session.chapter)
+        rounds = min(self.rounds, len(cards))
+        if not rounds:
+            await self._send(writer, f"No flashcards found for '{session.chapter}'.\n")
+            return True
+        score = 0
+        for i, position in enumerate(random.sample(range(len(cards)), rounds), 1):
+            fc = cards[position]
+            self.questions += 1
+            self.recent_questions.append(time.monotonic())
+            session.asked += 1
+            reply = await self._ask(session, reader, writer,
+                                    f"\n[{session.chapter}] Question {i}/{rounds}:\n{fc['question']}\n"
+                                    "Press Enter to reveal the answer...")
+            if reply is None:
+                return False
+            reply = await self._ask(session, reader, writer,
+                                    textwrap.fill(f"Answer: {fc['answer']}", width=80) +
+                                    "\nDid you get it right? (y/n) ")
+            if reply is None:
+                return False
+            if reply.lower().startswith("y"):
+                score += 1
+        session.score += score
+        await self._send(writer, f"\nQuiz finished — Score: {score}/{rounds} "
+                                 f"(this session: {session.score}/{session.asked})\n")
+        return True
+
+
+async def serve_quiz(db: Dict[str, List[Dict[str, str]]], host: str = "127.0.0.1", port: int = QUIZ_PORT,
+                     unix_path: Optional[str] = None, rounds: int = 5,
+                     idle_timeout: float = QUIZ_IDLE_TIMEOUT) -> None:
+    """Serve quizzes on a TCP port, or on a Unix socket when unix_path is given, until cancelled."""
+    quiz = QuizServer(db, rounds, idle_timeout)
+    if unix_path:
+        server = await asyncio.start_unix_server(quiz.handle, path=unix_path, backlog=QUIZ_BACKLOG)
+        where, hint = unix_path, f"nc -U {unix_path}"
+    else:
+        server = await asyncio.start_server(quiz.handle, host, port, backlog=QUIZ_BACKLOG)
+        where, hint = f"{host}:{port}", f"nc {host} {port}"
+    print(f"Quiz server listening on {where} — connect with '{hint}' (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+# --- Spaced repetition ---
+
+SECONDS_PER_DAY = 86400
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+
+class ReviewState:
+    """SM-2 scheduling state of one card."""
+
+    __slots__ = ("repetitions", "interval", "ease", "due", "reviews")
+
+    def __init__(self):
+        self.repetitions = 0
+        self.interval = 0
+        self.ease = DEFAULT_EASE
+        self.due = 0.0
+        self.reviews = 0
+
+    def update(self, quality: int, now: float) -> None:
+        """Apply one answer graded 0 (forgot) to 5 (perfect recall), following SM-2."""
+        if quality >= 3:
+            if self.repetitions == 0:
+                self.interval = 1
+            elif self.repetitions == 1:
+                self.interval = 6
+            else:
+                self.interval = round(self.interval * self.ease)
+            self.repetitions += 1
+        else:
+            self.repetitions = 0
+            self.interval = 1
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due = now + self.interval * SECONDS_PER_DAY
+        self.reviews += 1
+
+
+def card_key(chapter: str, question: str) -> Tuple[str, str]:
+    return (chapter, question)
+
+
+class Scheduler:
+    """Picks due cards from every chapter using a min-heap keyed on due time.
+
+    Reviewed cards sit in the heap as (due, sequence, key); new cards wait in
+    a queue in deck order and are shown once nothing is due. Each answer is
+    appended to the review log and the state is rebuilt by replaying it, so
+    the deck itself is never rewritten.
+    """
+
+    def __init__(self, log_filename: Optional[str] = None):
+        self.log_filename = log_filename
+        self.states: Dict[Tuple[str, str], ReviewState] = {}
+        self.cards: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self.heap: List[Tuple[float, int, Tuple[str, str]]] = []
+        self.new_cards = deque()
+        self._seq = 0
+        self._log = None
+
+    @classmethod
+    def load(cls, db: Dict[str, List[Dict[str, str]]], log_filename: Optional[str] = None) -> "Scheduler":
+        scheduler = cls(log_filename)
+        if log_filename and os.path.exists(log_filename):
+            with open(log_filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        key = card_key(*entry["card"])
+                        quality, when = int(entry["q"]), float(entry["t"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # skip a line cut short by a crash
+                    scheduler.states.setdefault(key, ReviewState()).update(quality, when)
+        for chapter in db:
+            for fc in db[chapter]:
+                scheduler._add(card_key(chapter, fc["question"]), fc)
+        heapq.heapify(scheduler.heap)
+        return scheduler
+
+    def _add(self, key: Tuple[str, str], fc: Dict[str, str]) -> None:
+        self.cards[key] = fc
+        state = self.states.get(key)
+        if state is None:
+            self.new_cards.append(key)
+        else:
+            self.heap.append((state.due, self._seq, key))
+            self._seq += 1
+
+    def add_card(self, chapter: str, question: str, answer: str) -> None:
+        key = card_key(chapter, question)
+        self.cards[key] = {"question": question, "answer": answer}
+        self.new_cards.append(key)
+
+    def edit_card(self, chapter: str, old_question: str, question: str, answer: str) -> None:
+        """Follow an edit; a changed question counts as a new card."""
+        if question == old_question:
+            self.cards[card_key(chapter, question)] = {"question": question, "answer": answer}
+        else:
+            self.cards.pop(card_key(chapter, old_question), None)
+            self.add_card(chapter, question, answer)
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return sum(1 for due, _, key in self.heap if due <= now and self.states[key].due == due)
+
+    def next_card(self, now: Optional[float] = None, include_new: bool = True) -> Optional[Tuple[str, str]]:
+        """Pop the most overdue card, or the next new card if nothing is due; None when done."""
+        now = time.time() if now is None else now
+        while self.heap and self.heap[0][0] <= now:
+            due, _, key = heapq.heappop(self.heap)
+            if self.states[key].due == due:
+                return key
+        while include_new and self.new_cards:
+            key = self.new_cards.popleft()
+            if key not in self.states:
+                return key
+        return None
+
+    def review(self, key: Tuple[str, str], quality: int, now: Optional[float] = None) -> ReviewState:
+        """Record an answer: update the card's state, requeue it and append it to the log."""
+        now = time.time() if now is None else now
+        state = self.states.setdefault(key, ReviewState())
+        state.update(quality, now)
+        heapq.heappush(self.heap, (state.due, self._seq, key))
+        self._seq += 1
+        if self.log_filename:
+            if self._log is None:
+                self._log = open(self.log_filename, "a", encoding="utf-8")
+            self._log.write(json.dumps({"card": list(key), "q": quality, "t": now}, ensure_ascii=False) + "\n")
+            self._log.flush()
+        return state
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def reviews_filename(db_filename: str) -> str:
+    return db_filename + ".reviews"
+
+
+def review_session(scheduler: Scheduler, rounds: int = 10) -> None:
+    """Ask up to `rounds` due cards from any chapter and grade each one for the scheduler."""
+    asked = 0
+    while asked < rounds:
+        key = scheduler.next_card()
+        if key is None:
+            break
+        fc = scheduler.cards.get(key)
+        if fc is None:
+            continue
+        asked += 1
+        print(f"\nCard {asked} [{key[0]}]:\n{fc['question']}")
+        input("Press Enter to reveal the answer...")
+        print(textwrap.fill(f"Answer: {fc['answer']}", width=80))
+        grade = input("How well did you know it? (0 = not at all ... 5 = perfectly) [3]: ").strip()
+        quality = int(grade) if grade.isdigit() and int(grade) <= 5 else 3
+        state = scheduler.review(key, quality)
+        print(f"Next review in {state.interval} day{'s' if state.interval != 1 else ''}.")
+    if asked == 0:
+        print("No cards are due right now — well done!\n")
+    else:
+        print(f"\nReview finished — {asked} card{'s' if asked != 1 else ''} reviewed.\n")
+
 # --- Utility for clean input ---
 
 def prompt_nonempty(prompt_text: str) -> str:
@@ -466,23 +1959,29 @@ def prompt_nonempty(prompt_text: str) -> str:
 
 # --- CLI/menu ---
 
-def main_menu():
-    db = load_db()
+def main_menu(backend: str = "json", filename: Optional[str] = None):
+    db = load_db(filename, backend)
+    filename = filename or (SQLITE_FILENAME if backend == "sqlite" else DB_FILENAME)
+    index = load_index(db, index_filename(filename))
+    scheduler = Scheduler.load(db, reviews_filename(filename))
+    journal = None if isinstance(db, SQLiteDB) else Journal(db, filename)
     print("\n=== Biology Flashcards Generator ===\n")
 
     while True:
-        print("Options:\n 1) List chapters\n 2) View chapter flashcards\n 3) Generate (sample) flashcards\n 4) Add flashcard\n 5) Export chapter to text file\n 6) Quiz mode\n 7) Save DB\n 8) Exit")
-        choice = input("Choose an option [1-8]: ").strip()
+        print("Options:\n 1) List chapters\n 2) View chapter flashcards\n 3) Generate (sample) flashcards\n 4) Add flashcard\n 5) Export chapter to text file\n 6) Quiz mode\n 7) Save DB\n 8) Exit\n 9) Search flashcards\n10) Review due cards (spaced repetition)\n11) Edit flashcard")
+        choice = input("Choose an option [1-11]: ").strip()
 
         if choice == "1":
             chapters = list_chapters(db)
+            counts = chapter_counts(db)
             print("\nAvailable chapters:")
             for c in chapters:
-                print(f" - {c} ({len(db.get(c, []))} cards)")
+                print(f" - {c} ({counts.get(c, 0)} cards)")
             print()
 
         elif choice == "2":
             chapter = prompt_nonempty("Enter chapter name: ")
+            chapter = resolve_chapter(db, chapter)
             cards = get_flashcards(db, chapter)
             if not cards:
                 print(f"No flashcards found for '{chapter}'.\n")
@@ -494,6 +1993,7 @@ def main_menu():
 
         elif choice == "3":
             chapter = prompt_nonempty("Enter chapter name: ")
+            chapter = resolve_chapter(db, chapter)
             n_str = input("How many cards to generate (Enter for all): ").strip()
             n = int(n_str) if n_str.isdigit() else None
             sample = generate_flashcards_for_chapter(db, chapter, n)
@@ -509,20 +2009,23 @@ def main_menu():
             chapter = prompt_nonempty("Enter chapter name to add to: ")
             question = prompt_nonempty("Enter question: ")
             answer = prompt_nonempty("Enter answer: ")
-            add_flashcard(db, chapter, question, answer)
-            print("Flashcard added. (Don't forget to save with option 7.)\n")
+            add_flashcard(db, chapter, question, answer, index, journal)
+            scheduler.add_card(chapter, question.strip(), answer.strip())
+            print("Flashcard added and saved.\n")
 
         elif choice == "5":
             chapter = prompt_nonempty("Enter chapter name to export: ")
+            chapter = resolve_chapter(db, chapter)
             cards = get_flashcards(db, chapter)
             if not cards:
                 print(f"No flashcards found for '{chapter}'.\n")
             else:
-                filename = export_to_text(cards, chapter)
-                print(f"Exported to {filename}\n")
+                out_file = export_to_text(cards, chapter)
+                print(f"Exported to {out_file}\n")
 
         elif choice == "6":
             chapter = prompt_nonempty("Enter chapter name for quiz: ")
+            chapter = resolve_chapter(db, chapter)
             cards = get_flashcards(db, chapter)
             if not cards:
                 print(f"No flashcards found for '{chapter}'.\n")
@@ -532,23 +2035,192 @@ def main_menu():
                 quiz_user(cards, rounds)
 
         elif choice == "7":
-            save_db(db)
-            print(f"Database saved to {DB_FILENAME}\n")
+            if journal is not None:
+                journal.sync()
+            else:
+                save_db(db, filename)
+            index.save(index_filename(filename), deck_fingerprint(db))
+            print(f"Database saved to {filename}\n")
 
         elif choice == "8":
-            save_prompt = input("Save changes before exit? (y/n) [y]: ").strip().lower()
-            if save_prompt in ("", "y", "yes"):
-                save_db(db)
-                print(f"Database saved to {DB_FILENAME}")
-            print("Goodbye!")
+            index.save(index_filename(filename), deck_fingerprint(db))
+            scheduler.close()
+            if journal is not None:
+                journal.close()
+            else:
+                save_db(db, filename)
+                db.close()
+            print(f"All changes are saved in {filename}. Goodbye!")
             break
 
+        elif choice == "9":
+            query = prompt_nonempty("Search for (end a word with * for prefix search): ")
+            results = search_flashcards(db, index, query)
+            if not results:
+                print(f"No flashcards match '{query}'.\n")
+            else:
+                print(f"\nTop {len(results)} results for '{query}':\n")
+                for i, (score, chapter, fc) in enumerate(results, 1):
+                    print(f"{i}. [{chapter}] (score {score:.2f})")
+                    print(f"Q: {fc['question']}")
+                    print(f"A: {fc['answer']}\n")
+
+        elif choice == "10":
+            due = scheduler.due_count()
+            print(f"{due} card{'s' if due != 1 else ''} due, {len(scheduler.new_cards)} new.")
+            rounds_str = input("How many cards? [default 10]: ").strip()
+            rounds = int(rounds_str) if rounds_str.isdigit() else 10
+            review_session(scheduler, rounds)
+
+        elif choice == "11":
+            chapter = prompt_nonempty("Enter chapter name: ")
+            chapter = resolve_chapter(db, chapter)
+            cards = get_flashcards(db, chapter)
+            if not cards:
+                print(f"No flashcards found for '{chapter}'.\n")
+                continue
+            for i, fc in enumerate(cards, 1):
+                print(f"{i}. {fc['question']}")
+            n_str = input("Number of the card to edit: ").strip()
+            if not n_str.isdigit() or not 1 <= int(n_str) <= len(cards):
+                print("No such card.\n")
+                continue
+            fc = cards[int(n_str) - 1]
+            question = input(f"New question (Enter to keep):\n  {fc['question']}\n> ").strip() or fc["question"]
+            answer = input(f"New answer (Enter to keep):\n  {fc['answer']}\n> ").strip() or fc["answer"]
+            edit_flashcard(db, chapter, int(n_str) - 1, question, answer, index, journal)
+            scheduler.edit_card(chapter, fc["question"], question, answer)
+            print("Flashcard updated and saved.\n")
+
         else:
-            print("Invalid option — please choose a number between 1 and 8.\n")
+            print("Invalid option — please choose a number between 1 and 11.\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Biology Flashcards Generator")
+    parser.add_argument("--backend", choices=BACKENDS, default="json",
+                        help="Where flashcards are stored (default: %(default)s)")
+    parser.add_argument("--db", help=f"Database file (default: {DB_FILENAME} or {SQLITE_FILENAME})")
+    parser.add_argument("--migrate", action="store_true",
+                        help=f"Copy the JSON deck ({DB_FILENAME}, or --db with a .json extension) "
+                             "into a new SQLite database and exit")
+    parser.add_argument("--import", dest="import_file", metavar="FILE",
+                        help="Add the cards from a CSV, TSV or JSON-lines file (chapter, question, answer) and exit")
+    parser.add_argument("--import-format", choices=IMPORT_FORMATS,
+                        help="Format of the --import file (default: from its extension)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE,
+                        help="Cards inserted per batch when importing (default: %(default)s)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Export every chapter into DIR (one folder per format) and exit")
+    parser.add_argument("--export-format", action="append", choices=EXPORT_FORMATS,
+                        help="Format to export; repeat for several (default: all)")
+    parser.add_argument("--archive", metavar="ZIP",
+                        help="Pack the exported files into one zip archive (with --export, or on its own)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Chapters exported at the same time (default: %(default)s)")
+    parser.add_argument("--serve", type=int, nargs="?", const=QUIZ_PORT, metavar="PORT",
+                        help=f"Run the quiz server on a TCP port (default port: {QUIZ_PORT})")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address the quiz server listens on (default: %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="Run the quiz server on a Unix socket instead")
+    parser.add_argument("--rounds", type=int, default=5, help="Questions per quiz on the server (default: %(default)s)")
+    parser.add_argument("--idle-timeout", type=float, default=QUIZ_IDLE_TIMEOUT,
+                        help="Seconds before an idle quiz connection is closed (default: %(default)s)")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="List groups of near-duplicate questions and exit")
+    parser.add_argument("--threshold", type=float, default=DEDUPE_THRESHOLD,
+                        help="Similarity (0-1) at which questions count as duplicates (default: %(default)s)")
+    parser.add_argument("--merge", action="store_true",
+                        help="With --dedupe: keep one card per group (the longest answer) and save the deck")
+
+    args = parser.parse_args()
+
+    if args.migrate:
+        target = args.db or SQLITE_FILENAME
+        source = json_filename_for(target)
+        try:
+            count = migrate_json_to_sqlite(source, target)
+        except FileExistsError as e:
+            print(e)
+            return
+        print(f"Migrated {count} flashcards from {source} to {target}")
+        return
+
+    if args.serve is not None or args.unix:
+        filename = args.db or (SQLITE_FILENAME if args.backend == "sqlite" else DB_FILENAME)
+        db = load_db(filename, args.backend)
+        try:
+            asyncio.run(serve_quiz(db, args.host, args.serve or QUIZ_PORT, args.unix,
+                                   args.rounds, args.idle_timeout))
+        finally:
+            if isinstance(db, SQLiteDB):
+                db.close()
+        return
+
+    if args.export or args.archive:
+        filename = args.db or (SQLITE_FILENAME if args.backend == "sqlite" else DB_FILENAME)
+        db = load_db(filename, args.backend)
+        out_dir = args.export or tempfile.mkdtemp(prefix="flashcards_export_")
+        try:
+            files, n_bytes, seconds = export_deck(db, out_dir, args.export_format or EXPORT_FORMATS,
+                                                  args.workers, args.archive)
+        finally:
+            if not args.export:
+                shutil.rmtree(out_dir, ignore_errors=True)
+            if isinstance(db, SQLiteDB):
+                db.close()
+        where = args.export or ""
+        if args.archive:
+            zipped = f"{args.archive} ({os.path.getsize(args.archive):,} bytes)"
+            where = f"{where} and {zipped}" if where else zipped
+        print(f"Exported {files} files ({n_bytes:,} bytes) to {where} in {seconds:.2f}s "
+              f"({n_bytes / max(seconds, 1e-9) / 1e6:,.1f} MB/s)")
+        return
+
+    if args.dedupe:
+        filename = args.db or (SQLITE_FILENAME if args.backend == "sqlite" else DB_FILENAME)
+        db = load_db(filename, args.backend)
+        start = time.perf_counter()
+        clusters = find_duplicate_clusters(db, args.threshold)
+        n_cards = sum(chapter_counts(db).values())
+        print(f"Checked {n_cards:,} cards in {time.perf_counter() - start:.2f}s: "
+              f"{len(clusters)} groups of near-duplicates.")
+        print_duplicate_clusters(db, clusters)
+        if args.merge and clusters:
+            removed = merge_duplicates(db, clusters)
+            save_db(db, filename)
+            if not isinstance(db, SQLiteDB):
+                # Card positions changed, so the journal no longer applies to the saved deck.
+                for path in (journal_filename(filename), journal_filename(filename) + ".old"):
+                    if os.path.exists(path):
+                        os.remove(path)
+            print(f"\nMerged: removed {removed} duplicate cards from {filename}.")
+        if isinstance(db, SQLiteDB):
+            db.close()
+        return
+
+    if args.import_file:
+        filename = args.db or (SQLITE_FILENAME if args.backend == "sqlite" else DB_FILENAME)
+        db = load_db(filename, args.backend)
+        try:
+            result = import_cards(db, read_import_rows(args.import_file, args.import_format), args.batch_size)
+        except OSError as e:
+            print(f"Error importing {args.import_file}: {e}", file=sys.stderr)
+            return
+        finally:
+            save_db(db, filename)
+            if isinstance(db, SQLiteDB):
+                db.close()
+        rate = result.rows / max(result.seconds, 1e-9)
+        print(f"Added {result.added:,} of {result.rows:,} rows to {filename} in {result.seconds:.2f}s "
+              f"({rate:,.0f} rows/s); skipped {result.duplicates:,} duplicates and {result.invalid:,} invalid rows.")
+        return
+
+    main_menu(args.backend, args.db)
 
 
 if __name__ == "__main__":
     try:
-        main_menu()
+        main()
     except KeyboardInterrupt:
         print("\nInterrupted — exiting. (Any unsaved changes may be lost.)")
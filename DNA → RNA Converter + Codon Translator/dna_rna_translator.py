@@ -1,5 +1,28 @@
 # DNA → RNA Converter + Codon Translator
 
+import argparse
+import functools
+import gzip
+import itertools
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # the NumPy backend is optional
+    np = None
+
+# Bases read per block when streaming FASTA/FASTQ files
+CHUNK_SIZE = 1 << 20
+
+# Bases per process-pool task in batch mode; small records are grouped up to this
+BATCH_TASK_BASES = 1 << 20
+
 # RNA Codon Table
 CODON_TABLE = {
     "UUU": "Phe", "UUC": "Phe",
@@ -7,7 +30,7 @@ CODON_TABLE = {
 
     "CUU": "Leu", "CUC": "Leu", "CUA": "Leu", "CUG": "Leu",
     "AUU": "Ile", "AUC": "Ile", "AUA": "Ile",
-    "AUG": "Met (Start)",
+    "AUG": "Met",
     
     "GUU": "Val", "GUC": "Val", "GUA": "Val", "GUG": "Val",
 
@@ -36,36 +59,1181 @@ CODON_TABLE = {
     "GGU": "Gly", "GGC": "Gly", "GGA": "Gly", "GGG": "Gly"
 }
 
+# Bases in codon-index order: a codon's index is 16*first + 4*second + third
+RNA_BASES = "ACGU"
+BACKENDS = ("python", "numpy")
+
+# Base → 0-3 lookup for the NumPy backend; 4 marks a non-ACGU character
+if np is not None:
+    BASE_CODES = np.full(256, 4, dtype=np.uint8)
+    for _code, _base in enumerate(RNA_BASES):
+        BASE_CODES[ord(_base)] = _code
+
+# ---------- GENETIC CODES ----------
+# NCBI translation tables by ID, as (name, amino acids, starts) written in
+# NCBI's UCAG codon order. "*" is a stop codon; "M" in starts marks a start.
+GENETIC_CODES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "--------------------------------MMMM---------------M------------"),
+    3: ("Yeast Mitochondrial",
+        "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "----------------------------------MM---------------M------------"),
+    4: ("Mold, Protozoan, and Coelenterate Mitochondrial; Mycoplasma/Spiroplasma",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM---------------M------------MMMM---------------M------------"),
+    5: ("Invertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+        "---M----------------------------MMMM---------------M------------"),
+    6: ("Ciliate, Dasycladacean and Hexamita Nuclear",
+        "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    9: ("Echinoderm and Flatworm Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    10: ("Euplotid Nuclear",
+         "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    11: ("Bacterial, Archaeal and Plant Plastid",
+         "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M---------------M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear",
+         "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-------------------M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+         "---M------------------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial",
+         "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+}
+NCBI_BASES = "UCAG"
+
+THREE_LETTER = {
+    "A": "Ala", "R": "Arg", "N": "Asn", "D": "Asp", "C": "Cys",
+    "Q": "Gln", "E": "Glu", "G": "Gly", "H": "His", "I": "Ile",
+    "L": "Leu", "K": "Lys", "M": "Met", "F": "Phe", "P": "Pro",
+    "S": "Ser", "T": "Thr", "W": "Trp", "Y": "Tyr", "V": "Val",
+    "*": "STOP",
+}
+
+# A translation table compiled for fast lookups. names, letters, starts and
+# stops are indexed by codon index (0-63); lookup/letter_lookup map codon
+# strings. starts/stops are the table's initiation and termination masks;
+# start_codons/stop_codons list the same codons as RNA strings. The np_* arrays have a 65th entry for
+# codons with non-ACGU characters ("Invalid" / "X") and are None when NumPy
+# is missing.
+GeneticCode = namedtuple("GeneticCode", [
+    "table_id", "name", "names", "letters", "starts", "stops",
+    "start_codons", "stop_codons", "lookup", "letter_lookup", "np_names", "np_letters", "np_stops",
+])
+
+
+# Compile a table on first use; later calls return the cached GeneticCode
+@functools.lru_cache(maxsize=None)
+def get_genetic_code(table=1):
+    if table not in GENETIC_CODES:
+        choices = ", ".join(str(t) for t in sorted(GENETIC_CODES))
+        raise ValueError(f"Unknown genetic code {table!r}; choose from {choices}")
+    name, aminos, starts = GENETIC_CODES[table]
+    ncbi_order = {"".join(c): i for i, c in enumerate(itertools.product(NCBI_BASES, repeat=3))}
+    codons = ["".join(c) for c in itertools.product(RNA_BASES, repeat=3)]
+    letters = "".join(aminos[ncbi_order[c]] for c in codons)
+    names = tuple(THREE_LETTER[letter] for letter in letters)
+    start_mask = tuple(starts[ncbi_order[c]] == "M" for c in codons)
+    stop_mask = tuple(letter == "*" for letter in letters)
+    np_names = np_letters = np_stops = None
+    if np is not None:
+        np_names = np.array(names + ("Invalid",), dtype=object)
+        np_letters = np.array(list(letters) + ["X"], dtype=object)
+        np_stops = np.array(stop_mask + (False,))
+    return GeneticCode(
+        table_id=table,
+        name=name,
+        names=names,
+        letters=letters,
+        starts=start_mask,
+        stops=stop_mask,
+        start_codons=tuple(c for c, start in zip(codons, start_mask) if start),
+        stop_codons=tuple(c for c, stop in zip(codons, stop_mask) if stop),
+        lookup=dict(zip(codons, names)),
+        letter_lookup=dict(zip(codons, letters)),
+        np_names=np_names,
+        np_letters=np_letters,
+        np_stops=np_stops,
+    )
+
 # Validate DNA sequence
+DNA_BASES = frozenset("ATGC")
+
+
 def is_valid_dna(dna):
-    return all(base in "ATGC" for base in dna)
+    return set(dna) <= DNA_BASES
 
 # DNA → RNA
 def dna_to_rna(dna):
     return dna.replace("T", "U")
 
-# RNA → Amino Acids
-def rna_to_protein(rna):
+# RNA → Amino Acids (to_stop=False keeps reading past STOP codons).
+# backend="numpy" gives the same result using vectorized codon lookups,
+# table picks an NCBI genetic code and one_letter gives "M", "F", ..., "*".
+def rna_to_protein(rna, to_stop=True, backend="python", table=1, one_letter=False):
+    if backend == "numpy":
+        return rna_to_protein_numpy(rna, to_stop, table, one_letter)
+    if backend != "python":
+        raise ValueError(f"Unknown backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    code = get_genetic_code(table)
+    if one_letter:
+        lookup, stop, invalid = code.letter_lookup, "*", "X"
+    else:
+        lookup, stop, invalid = code.lookup, "STOP", "Invalid"
     protein = []
     for i in range(0, len(rna), 3):
         codon = rna[i:i+3]
         if len(codon) < 3:
             break
-        amino = CODON_TABLE.get(codon, "Invalid")
+        amino = lookup.get(codon, invalid)
         protein.append(amino)
-        if amino == "STOP":
+        if amino == stop and to_stop:
             break
     return protein
 
+# RNA → Amino Acids with NumPy: bases become 0-3, each codon an index 0-63,
+# and amino acids are gathered from the genetic code's array in one step
+def rna_to_protein_numpy(rna, to_stop=True, table=1, one_letter=False):
+    if np is None:
+        raise RuntimeError("The numpy backend requires NumPy (pip install numpy)")
+    n = len(rna) - len(rna) % 3
+    raw = np.frombuffer(rna[:n].encode("ascii", "replace"), dtype=np.uint8)
+    codes = BASE_CODES[raw].reshape(-1, 3)
+    index = codes[:, 0].astype(np.intp) * 16 + codes[:, 1] * 4 + codes[:, 2]
+    index[(codes == 4).any(axis=1)] = 64
+    return codon_indices_to_protein(index, to_stop, table, one_letter)
+
+
+# Amino acids for an array of codon indices (NumPy), cut after the first STOP if to_stop
+def codon_indices_to_protein(index, to_stop=True, table=1, one_letter=False):
+    code = get_genetic_code(table)
+    if to_stop:
+        stops = np.flatnonzero(code.np_stops[index])
+        if stops.size:
+            index = index[:stops[0] + 1]
+    return (code.np_letters if one_letter else code.np_names)[index].tolist()
+
+# {codon: label} with the table's initiation codons marked "(Start)"
+def codon_labels(table=1, one_letter=False):
+    code = get_genetic_code(table)
+    names = code.letters if one_letter else code.names
+    codons = ("".join(c) for c in itertools.product(RNA_BASES, repeat=3))
+    return {codon: f"{name} (Start)" if start else name
+            for codon, name, start in zip(codons, names, code.starts)}
+
 # Print Codon Table
-def print_codon_table():
-    print("RNA Codon Table:")
-    for codon, amino in CODON_TABLE.items():
-        print(f"{codon}: {amino}")
-        
+def print_codon_table(table=1, one_letter=False):
+    code = get_genetic_code(table)
+    labels = codon_labels(table, one_letter)
+    print("RNA Codon Table:" if table == 1 else f"RNA Codon Table ({code.name}):")
+    for codon in CODON_TABLE:
+        print(f"{codon}: {labels[codon]}")
+
+
+# ---------- SIX-FRAME TRANSLATION + ORFs ----------
+
+COMPLEMENT = str.maketrans("ATGCUatgcu", "TACGAtacga")
+START_CODON = "ATG"
+STOP_CODONS = ("TAA", "TAG", "TGA")
+
+
+# (regex matching every start or stop codon, set of start codons) as DNA.
+# table=None is the classic ATG→TAA/TAG/TGA rule; a table ID uses that
+# genetic code's start and stop masks (e.g. GTG/TTG starts in table 11).
+@functools.lru_cache(maxsize=None)
+def orf_codons(table=None):
+    if table is None:
+        starts, stops = (START_CODON,), STOP_CODONS
+    else:
+        code = get_genetic_code(table)
+        starts = tuple(c.replace("U", "T") for c in code.start_codons)
+        stops = tuple(c.replace("U", "T") for c in code.stop_codons)
+    return re.compile(f"(?=({'|'.join(starts + stops)}))"), frozenset(starts)
+
+# start/end are 0-based, end-exclusive forward-strand coordinates (stop codon included)
+ORF = namedtuple("ORF", ["start", "end", "strand", "frame"])
+
+
+# Reverse complement of a DNA sequence
+def reverse_complement(dna):
+    return dna.translate(COMPLEMENT)[::-1]
+
+
+# Translate all six reading frames: {("+", 0): [...], ..., ("-", 2): [...]}
+def six_frame_translation(dna, backend="python", table=1, one_letter=False):
+    frames = {}
+    for strand, seq in (("+", dna), ("-", reverse_complement(dna))):
+        rna = dna_to_rna(seq.upper())
+        for frame in range(3):
+            frames[(strand, frame)] = rna_to_protein(rna[frame:], False, backend, table, one_letter)
+    return frames
+
+
+# ORFs of one strand as (start, end, frame) in that strand's coordinates.
+# Each ORF runs from the first start codon after the previous stop to the next stop.
+def _strand_orfs(seq, min_length, table=None):
+    events, starts = orf_codons(table)
+    open_start = [None, None, None]
+    for match in events.finditer(seq):
+        pos = match.start()
+        frame = pos % 3
+        if match.group(1) in starts:
+            if open_start[frame] is None:
+                open_start[frame] = pos
+        elif open_start[frame] is not None:
+            start, open_start[frame] = open_start[frame], None
+            if pos + 3 - start >= min_length:
+                yield start, pos + 3, frame
+
+
+# Find every ATG→STOP open reading frame on both strands, or with a table ID
+# every ORF using that genetic code's start and stop codons.
+# min_length is in bases, counting the stop codon.
+def find_orfs(dna, min_length=0, table=None):
+    dna = dna.upper().replace("U", "T")
+    n = len(dna)
+    orfs = [ORF(start, end, "+", frame) for start, end, frame in _strand_orfs(dna, min_length, table)]
+    for start, end, frame in _strand_orfs(reverse_complement(dna), min_length, table):
+        orfs.append(ORF(n - end, n - start, "-", frame))
+    orfs.sort()
+    return orfs
+
+
+# DNA of an ORF read 5'→3' on its own strand, ready for dna_to_rna/rna_to_protein
+def orf_sequence(dna, orf):
+    seq = dna[orf.start:orf.end]
+    return reverse_complement(seq) if orf.strand == "-" else seq
+
+
+# Static interval index over ORFs (an implicit augmented interval tree laid
+# out over the start-sorted array), answering overlap queries in O(log n + k)
+class ORFIndex:
+    def __init__(self, orfs):
+        self.orfs = sorted(orfs)
+        self.starts = [orf.start for orf in self.orfs]
+        self.ends = [orf.end for orf in self.orfs]
+        self.max_ends = list(self.ends)
+        self.max_level = self._build()
+
+    def __len__(self):
+        return len(self.orfs)
+
+    def _build(self):
+        n = len(self.orfs)
+        if n == 0:
+            return -1
+        ends, max_ends = self.ends, self.max_ends
+        last_i = (n - 1) & ~1
+        last = ends[last_i]
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                right = max_ends[i + x] if i + x < n else last
+                max_ends[i] = max(ends[i], max_ends[i - x], right)
+            last_i = last_i - x if last_i >> k & 1 else last_i + x
+            if last_i < n and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            k += 1
+        return k - 1
+
+    # ORFs overlapping the half-open region [start, end)
+    def overlapping(self, start, end):
+        n = len(self.orfs)
+        if n == 0:
+            return []
+        starts, ends, max_ends = self.starts, self.ends, self.max_ends
+        hits = []
+        stack = [(self.max_level, (1 << self.max_level) - 1, False)]
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= 3:
+                i = x >> k << k
+                stop = min(i + (1 << (k + 1)) - 1, n)
+                while i < stop and starts[i] < end:
+                    if start < ends[i]:
+                        hits.append(i)
+                    i += 1
+            elif not left_done:
+                y = x - (1 << (k - 1))
+                stack.append((k, x, True))
+                if y >= n or max_ends[y] > start:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] < end:
+                if start < ends[x]:
+                    hits.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return [self.orfs[i] for i in sorted(hits)]
+
+    # ORFs covering one position
+    def at(self, position):
+        return self.overlapping(position, position + 1)
+
+
+# ---------- STREAMING (FASTA / FASTQ) ----------
+
+# Open a sequence file for reading ("-" is stdin, .gz is decompressed)
+def open_sequence_file(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path, "r")
+
+
+# Guess the record format from the file name
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.lower().endswith((".fq", ".fastq")):
+        return "fastq"
+    return "fasta"
+
+
+# Yield (record_no, name, chunk) from FASTA text read in fixed-size blocks.
+# A record's chunks come out consecutively; its first chunk is always ""
+# so records with no sequence still show up downstream.
+def read_fasta_chunks(handle, chunk_size=CHUNK_SIZE):
+    record = -1
+    name = None
+    header = []
+    in_header = False
+    while True:
+        block = handle.read(chunk_size)
+        if not block:
+            break
+        pos = 0
+        while pos < len(block):
+            if in_header:
+                nl = block.find("\n", pos)
+                if nl == -1:
+                    header.append(block[pos:])
+                    break
+                header.append(block[pos:nl])
+                name = "".join(header).strip()
+                header = []
+                in_header = False
+                record += 1
+                pos = nl + 1
+                yield record, name, ""
+                continue
+            gt = block.find(">", pos)
+            end = len(block) if gt == -1 else gt
+            piece = "".join(block[pos:end].split())
+            if piece:
+                if name is None:
+                    raise ValueError("FASTA input must start with a '>' header line")
+                yield record, name, piece
+            if gt == -1:
+                break
+            in_header = True
+            pos = gt + 1
+    if in_header:
+        yield record + 1, "".join(header).strip(), ""
+
+
+# Yield (record_no, name, chunk) from FASTQ text. FASTQ reads are short and
+# one line each, so records are read line by line and only sliced to size.
+def read_fastq_chunks(handle, chunk_size=CHUNK_SIZE):
+    lines = (line.rstrip("\r\n") for line in handle)
+    for record, header in enumerate(lines):
+        if not header.startswith("@"):
+            raise ValueError(f"Malformed FASTQ record {record + 1}: expected '@' header")
+        seq = next(lines, "")
+        next(lines, None)  # "+" separator
+        next(lines, None)  # quality string
+        yield record, header[1:].strip(), ""
+        for i in range(0, len(seq), chunk_size):
+            yield record, header[1:].strip(), seq[i:i + chunk_size]
+
+
+def read_sequence_chunks(handle, fmt="fasta", chunk_size=CHUNK_SIZE):
+    if fmt == "fastq":
+        return read_fastq_chunks(handle, chunk_size)
+    return read_fasta_chunks(handle, chunk_size)
+
+
+# Whole records as (name, sequence), for work that needs the full sequence
+def read_records(handle, fmt="fasta", chunk_size=CHUNK_SIZE):
+    chunks = read_sequence_chunks(handle, fmt, chunk_size)
+    for (_, name), group in itertools.groupby(chunks, key=lambda c: (c[0], c[1])):
+        yield name, "".join(chunk for _, _, chunk in group)
+
+
+# Translate one record's DNA chunks, carrying partial codons across chunk
+# boundaries. Yields lists of amino acids as each chunk is translated.
+def translate_chunks(chunks, to_stop=True, backend="python", table=1, one_letter=False):
+    carry = ""
+    for chunk in chunks:
+        rna = carry + dna_to_rna(chunk.upper())
+        cut = len(rna) - len(rna) % 3
+        carry = rna[cut:]
+        protein = rna_to_protein(rna[:cut], to_stop, backend, table, one_letter)
+        if protein:
+            yield protein
+            if to_stop and protein[-1] == ("*" if one_letter else "STOP"):
+                return
+
+
+# Group a chunk stream into records: yields (name, protein_chunks) per record.
+# stats (a dict) is updated with the records and bases seen.
+def translate_stream(chunks, to_stop=True, stats=None, backend="python", table=1, one_letter=False):
+    if stats is None:
+        stats = {}
+    stats.setdefault("records", 0)
+    stats.setdefault("bases", 0)
+
+    def counted():
+        for item in chunks:
+            stats["bases"] += len(item[2])
+            yield item
+
+    for (_, name), group in itertools.groupby(counted(), key=lambda c: (c[0], c[1])):
+        stats["records"] += 1
+        yield name, translate_chunks((chunk for _, _, chunk in group), to_stop, backend, table, one_letter)
+
+
+# Write translated records as ">name" lines followed by the amino acid chain
+def write_proteins(out, translated, sep="-"):
+    for name, pieces in translated:
+        out.write(f">{name}\n")
+        first = True
+        for piece in pieces:
+            if not first:
+                out.write(sep)
+            out.write(sep.join(piece))
+            first = False
+        out.write("\n")
+
+
+# Stream-translate a whole FASTA/FASTQ file; returns records/bases/seconds
+def translate_file(path, out, fmt=None, chunk_size=CHUNK_SIZE, to_stop=True, backend="python",
+                   table=1, one_letter=False):
+    fmt = fmt or detect_format(path)
+    stats = {"records": 0, "bases": 0}
+    start = time.perf_counter()
+    handle = open_sequence_file(path)
+    try:
+        chunks = read_sequence_chunks(handle, fmt, chunk_size)
+        translated = translate_stream(chunks, to_stop, stats, backend, table, one_letter)
+        write_proteins(out, translated, "" if one_letter else "-")
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+# Write the ORFs of every record in a FASTA/FASTQ file as tab-separated rows
+def write_orfs_file(path, out, fmt=None, min_length=0, table=None):
+    handle = open_sequence_file(path)
+    count = 0
+    try:
+        out.write("record\tstart\tend\tstrand\tframe\tlength\n")
+        for name, seq in read_records(handle, fmt or detect_format(path)):
+            for orf in find_orfs(seq, min_length, table):
+                out.write(f"{name}\t{orf.start}\t{orf.end}\t{orf.strand}\t{orf.frame}\t{orf.end - orf.start}\n")
+                count += 1
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return count
+
+
+# ---------- MEMORY-MAPPED FILES ----------
+# Raw sequence files (bases plus line breaks, no FASTA headers) are mapped
+# into memory and processed one window at a time, so peak memory depends on
+# chunk_size rather than on the size of the file.
+
+ALLOWED_FILE_BYTES = b"ATGC\r\n"
+INVALID_BYTE_RE = re.compile(rb"[^ATGC\r\n]")
+TRANSCRIBE_BYTES = bytes.maketrans(b"T", b"U")
+
+
+# Yield consecutive (offset, window) slices of a mapped file
+def _mapped_windows(path, chunk_size):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, len(mm), chunk_size):
+                yield offset, mm[offset:offset + chunk_size]
+
+
+# Yield (byte offset, character) for every invalid base in a raw DNA file.
+# Clean windows are skipped after one bulk translate/delete check.
+def iter_invalid_bases(path, chunk_size=CHUNK_SIZE):
+    for offset, window in _mapped_windows(path, chunk_size):
+        if not window.translate(None, ALLOWED_FILE_BYTES):
+            continue
+        for match in INVALID_BYTE_RE.finditer(window):
+            yield offset + match.start(), match.group().decode("latin-1")
+
+
+def is_valid_dna_file(path, chunk_size=CHUNK_SIZE):
+    return next(iter_invalid_bases(path, chunk_size), None) is None
+
+
+# Transcribe a raw DNA file to RNA (T → U) window by window; returns bytes written
+def transcribe_file(src, dst, chunk_size=CHUNK_SIZE):
+    written = 0
+    with open(dst, "wb") as out:
+        for _, window in _mapped_windows(src, chunk_size):
+            written += out.write(window.translate(TRANSCRIBE_BYTES))
+    return written
+
+
+# ---------- 2-BIT PACKED SEQUENCES ----------
+
+# 2-bit codes follow RNA_BASES order (A=0, C=1, G=2, T/U=3), so the complement
+# of a code is 3 - code and three codes make a GeneticCode codon index
+PACK_CODES = bytes.maketrans(b"ACGTU", b"\x00\x01\x02\x03\x03")
+PACKED_BASES = frozenset("ACGTU")
+_PACK_QUADS = {a + b + c + d: i | j << 2 | k << 4 | m << 6
+               for i, a in enumerate("ACGT") for j, b in enumerate("ACGT")
+               for k, c in enumerate("ACGT") for m, d in enumerate("ACGT")}
+_UNPACK_QUADS = {code: quad for quad, code in _PACK_QUADS.items()}
+
+
+def _pack(seq):
+    seq = seq.upper()
+    if not set(seq) <= PACKED_BASES:
+        raise ValueError("PackedSequence only stores A, C, G and T/U")
+    if np is not None:
+        codes = np.frombuffer(seq.encode("ascii").translate(PACK_CODES), dtype=np.uint8)
+        codes = np.concatenate([codes, np.zeros(-len(codes) % 4, dtype=np.uint8)]).reshape(-1, 4)
+        return bytearray((codes[:, 0] | codes[:, 1] << 2 | codes[:, 2] << 4 | codes[:, 3] << 6).tobytes())
+    seq = seq.replace("U", "T") + "A" * (-len(seq) % 4)
+    return bytearray(_PACK_QUADS[seq[i:i + 4]] for i in range(0, len(seq), 4))
+
+
+# DNA stored at 4 bases per byte. Slices (step 1) and reverse complements are
+# views over the same buffer, so neither copies the sequence.
+class PackedSequence:
+    __slots__ = ("_data", "_start", "_length", "_reverse")
+
+    def __init__(self, seq=""):
+        self._data = _pack(seq)
+        self._start = 0
+        self._length = len(seq)
+        self._reverse = False
+
+    @classmethod
+    def _view(cls, data, start, length, reverse):
+        view = cls.__new__(cls)
+        view._data, view._start, view._length, view._reverse = data, start, length, reverse
+        return view
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return PackedSequence(str(self)[key])
+            length = max(stop - start, 0)
+            if self._reverse:
+                start = self._length - start - length
+            return self._view(self._data, self._start + start, length, self._reverse)
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("PackedSequence index out of range")
+        pos = self._start + (self._length - 1 - key if self._reverse else key)
+        code = self._data[pos >> 2] >> ((pos & 3) * 2) & 3
+        return "ACGT"[3 - code if self._reverse else code]
+
+    def reverse_complement(self):
+        return self._view(self._data, self._start, self._length, not self._reverse)
+
+    def __str__(self):
+        first, last = self._start >> 2, (self._start + self._length + 3) >> 2
+        offset = self._start & 3
+        seq = "".join(_UNPACK_QUADS[b] for b in self._data[first:last])[offset:offset + self._length]
+        return reverse_complement(seq) if self._reverse else seq
+
+    def __repr__(self):
+        text = str(self[:20]) + ("..." if self._length > 20 else "")
+        return f"PackedSequence({text!r}, length={self._length})"
+
+    # Equal to the uppercase DNA string it holds (so hashes match that str);
+    # lowercase or RNA strings are not normalised and compare unequal
+    def __eq__(self, other):
+        if isinstance(other, (PackedSequence, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    # 2-bit codes of this view, one per base (a NumPy array when available)
+    def codes(self):
+        if np is None:
+            return str(self).encode("ascii").translate(PACK_CODES)
+        first, last = self._start >> 2, (self._start + self._length + 3) >> 2
+        raw = np.frombuffer(self._data, dtype=np.uint8)[first:last]
+        codes = np.stack([raw & 3, raw >> 2 & 3, raw >> 4 & 3, raw >> 6], axis=1).ravel()
+        offset = self._start & 3
+        codes = codes[offset:offset + self._length]
+        return 3 - codes[::-1] if self._reverse else codes
+
+    # Codon indices (0-63, see GeneticCode) of one reading frame, as bytes
+    def codon_indices(self, frame=0):
+        codes = self.codes()[frame:]
+        n = len(codes) - len(codes) % 3
+        if np is not None:
+            codons = codes[:n].reshape(-1, 3)
+            return (codons[:, 0] * 16 + codons[:, 1] * 4 + codons[:, 2]).astype(np.uint8).tobytes()
+        return bytes(16 * codes[i] + 4 * codes[i + 1] + codes[i + 2] for i in range(0, n, 3))
+
+    # Same result as rna_to_protein(dna_to_rna(str(seq))[frame:], to_stop, ...)
+    def translate(self, frame=0, to_stop=True, table=1, one_letter=False):
+        index = self.codon_indices(frame)
+        if np is not None:
+            return codon_indices_to_protein(np.frombuffer(index, dtype=np.uint8), to_stop, table, one_letter)
+        code = get_genetic_code(table)
+        names = code.letters if one_letter else code.names
+        protein = []
+        for i in index:
+            protein.append(names[i])
+            if to_stop and code.stops[i]:
+                break
+        return protein
+
+
+# ---------- CODON USAGE + K-MER COUNTING ----------
+
+MAX_K = 12
+
+# Up to this k, k-mer counts live in a dense array of 4**k slots (512 KB at
+# k=8). Longer k-mers start sparse, so memory follows the distinct k-mers
+# seen, and move to a dense array once more than 1/SPARSE_MAX_FILL of the
+# slots are in use (a sparse key and count take twice a dense slot's space).
+DENSE_MAX_K = 8
+SPARSE_MAX_FILL = 8
+
+# Distinct k-mers buffered before a SparseKmerCounts folds them into its table
+SPARSE_BUFFER = 1 << 16
+
+# Base → 2-bit code for DNA or RNA in either case; 4 marks anything else
+if np is not None:
+    DNA_CODES = np.full(256, 4, dtype=np.uint8)
+    for _code, _bases in enumerate(("Aa", "Cc", "Gg", "TtUu")):
+        for _base in _bases:
+            DNA_CODES[ord(_base)] = _code
+
+_BASE_TO_CODE = {"A": 0, "C": 1, "G": 2, "T": 3}
+
+
+# Sparse k-mer tally: sorted unique keys with their counts. New (key, count)
+# arrays are buffered and folded in once the buffer outgrows the table, so
+# adding a chunk costs about its own size rather than the table's.
+class SparseKmerCounts:
+    def __init__(self):
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self._pending = []
+        self._pending_size = 0
+
+    # Add k-mer indices (counts=None) or already-tallied keys and counts
+    def add(self, keys, counts=None):
+        if counts is None:
+            keys, counts = np.unique(keys, return_counts=True)
+        self._pending.append((keys, counts))
+        self._pending_size += len(keys)
+        if self._pending_size >= max(len(self.keys), SPARSE_BUFFER):
+            self._compact()
+
+    def _compact(self):
+        if not self._pending:
+            return
+        keys = np.concatenate([self.keys] + [k for k, _ in self._pending])
+        counts = np.concatenate([self.counts] + [c for _, c in self._pending])
+        self._pending = []
+        self._pending_size = 0
+        if not len(keys):
+            return
+        order = np.argsort(keys, kind="stable")
+        keys, counts = keys[order], counts[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        self.keys = keys[starts]
+        self.counts = np.add.reduceat(counts, starts)
+
+    # (keys, counts) arrays, sorted by key
+    def items(self):
+        self._compact()
+        return self.keys, self.counts
+
+    def __getstate__(self):
+        self._compact()
+        return self.__dict__
+
+
+# Codon usage (frame 0 of each record) and k-mer counts, fed one chunk at a
+# time so whole genomes can be counted while streaming. Counters built by
+# different workers combine with merge().
+class SequenceCounts:
+    def __init__(self, k=0):
+        if not 0 <= k <= MAX_K:
+            raise ValueError(f"k must be between 0 and {MAX_K}")
+        self.k = k
+        self.records = 0
+        self.bases = 0
+        if np is not None:
+            self.codons = np.zeros(64, dtype=np.int64)
+            if k > DENSE_MAX_K:
+                self.kmers = SparseKmerCounts()
+            else:
+                self.kmers = np.zeros(4 ** k if k else 0, dtype=np.int64)
+        else:
+            self.codons = [0] * 64
+            self.kmers = Counter()
+        self._codon_carry = ""
+        self._kmer_carry = ""
+
+    # Count the next chunk of the current record
+    def update(self, chunk):
+        self.bases += len(chunk)
+        seq = self._codon_carry + chunk
+        cut = len(seq) - len(seq) % 3
+        self._codon_carry = seq[cut:]
+        self._count_codons(seq[:cut])
+        if self.k:
+            seq = self._kmer_carry + chunk
+            self._kmer_carry = seq[-(self.k - 1):] if self.k > 1 else ""
+            self._count_kmers(seq)
+
+    # Finish the current record so no codon or k-mer spans two records
+    def end_record(self):
+        self.records += 1
+        self._codon_carry = ""
+        self._kmer_carry = ""
+
+    def _count_codons(self, seq):
+        if np is not None:
+            codes = DNA_CODES[np.frombuffer(seq.encode("ascii", "replace"), dtype=np.uint8)].reshape(-1, 3)
+            codes = codes[(codes < 4).all(axis=1)].astype(np.intp)
+            self.codons += np.bincount(codes[:, 0] * 16 + codes[:, 1] * 4 + codes[:, 2], minlength=64)
+            return
+        seq = seq.upper()
+        for i in range(0, len(seq), 3):
+            a, b, c = (_BASE_TO_CODE.get(base) for base in seq[i:i + 3].replace("U", "T"))
+            if a is not None and b is not None and c is not None:
+                self.codons[16 * a + 4 * b + c] += 1
+
+    # Rolling 2-bit encoding: each k-mer is an integer below 4**k
+    def _count_kmers(self, seq):
+        k = self.k
+        n = len(seq) - k + 1
+        if n <= 0:
+            return
+        if np is not None:
+            codes = DNA_CODES[np.frombuffer(seq.encode("ascii", "replace"), dtype=np.uint8)]
+            index = np.zeros(n, dtype=np.int64)
+            for j in range(k):
+                index = (index << 2) | codes[j:j + n]
+            invalid = np.concatenate(([0], np.cumsum(codes == 4)))
+            index = index[invalid[k:] == invalid[:n]]
+            if isinstance(self.kmers, SparseKmerCounts):
+                self._add_sparse(index)
+            elif self.k > DENSE_MAX_K:
+                found, counts = np.unique(index, return_counts=True)
+                self.kmers[found] += counts
+            else:
+                self.kmers += np.bincount(index, minlength=len(self.kmers))
+            return
+        mask = (1 << 2 * k) - 1
+        value = run = 0
+        for base in seq.upper().replace("U", "T"):
+            code = _BASE_TO_CODE.get(base)
+            if code is None:
+                value = run = 0
+                continue
+            value = (value << 2 | code) & mask
+            run += 1
+            if run >= k:
+                self.kmers[value] += 1
+
+    def _add_sparse(self, keys, counts=None):
+        self.kmers.add(keys, counts)
+        if len(self.kmers.keys) > 4 ** self.k // SPARSE_MAX_FILL:
+            keys, counts = self.kmers.items()
+            self.kmers = np.zeros(4 ** self.k, dtype=np.int64)
+            self.kmers[keys] = counts
+
+    # Add another counter's totals into this one (e.g. from a worker process)
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError("Cannot merge counts for different k")
+        self.records += other.records
+        self.bases += other.bases
+        if np is not None:
+            self.codons += other.codons
+            if not isinstance(other.kmers, SparseKmerCounts):
+                if isinstance(self.kmers, SparseKmerCounts):
+                    keys, counts = self.kmers.items()
+                    self.kmers = other.kmers.copy()
+                    self.kmers[keys] += counts
+                else:
+                    self.kmers += other.kmers
+            elif isinstance(self.kmers, SparseKmerCounts):
+                self._add_sparse(*other.kmers.items())
+            else:
+                keys, counts = other.kmers.items()
+                self.kmers[keys] += counts
+        else:
+            self.codons = [a + b for a, b in zip(self.codons, other.codons)]
+            self.kmers.update(other.kmers)
+        return self
+
+    # Only non-zero k-mer slots are pickled, keeping worker results small
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if np is not None and isinstance(self.kmers, np.ndarray):
+            found = np.flatnonzero(self.kmers)
+            state["kmers"] = (len(self.kmers), found, self.kmers[found])
+        return state
+
+    def __setstate__(self, state):
+        if np is not None and isinstance(state["kmers"], tuple):
+            size, found, counts = state["kmers"]
+            state["kmers"] = np.zeros(size, dtype=np.int64)
+            state["kmers"][found] = counts
+        self.__dict__.update(state)
+
+    # {"AUG": count, ...} in RNA codon order
+    def codon_usage(self):
+        codons = ("".join(c) for c in itertools.product(RNA_BASES, repeat=3))
+        return {codon: int(count) for codon, count in zip(codons, self.codons)}
+
+    # Codon counts summed per amino acid of a genetic code
+    def amino_acid_composition(self, table=1, one_letter=False):
+        code = get_genetic_code(table)
+        composition = Counter()
+        for amino, count in zip(code.letters if one_letter else code.names, self.codons):
+            composition[amino] += int(count)
+        return dict(composition)
+
+    def kmer_string(self, index):
+        return "".join("ACGT"[index >> 2 * (self.k - 1 - j) & 3] for j in range(self.k))
+
+    # [(kmer, count), ...] for the n most frequent k-mers
+    def most_common_kmers(self, n=10):
+        if np is None:
+            return [(self.kmer_string(i), c) for i, c in self.kmers.most_common(n)]
+        if isinstance(self.kmers, SparseKmerCounts):
+            keys, counts = self.kmers.items()
+        else:
+            keys, counts = None, self.kmers
+        if not len(counts):
+            return []
+        n = min(n, len(counts))
+        top = np.argpartition(counts, -n)[-n:]
+        top = top[np.argsort(-counts[top], kind="stable")]
+        return [(self.kmer_string(int(i if keys is None else keys[i])), int(counts[i])) for i in top if counts[i]]
+
+
+# Count a (record_no, name, chunk) stream as produced by read_sequence_chunks
+def count_chunks(chunks, k=0, counts=None):
+    counts = counts if counts is not None else SequenceCounts(k)
+    current = None
+    for record, _, chunk in chunks:
+        if record != current:
+            if current is not None:
+                counts.end_record()
+            current = record
+        counts.update(chunk)
+    if current is not None:
+        counts.end_record()
+    return counts
+
+
+# Worker: count one task of (record_no, chunk) pieces. `carry` holds the codon
+# and k-mer tails of a record continued from the previous task, which has
+# already counted that record.
+def count_task(chunks, k=0, carry=None):
+    counts = SequenceCounts(k)
+    if carry is not None:
+        counts._codon_carry, counts._kmer_carry = carry
+        counts.records -= 1
+    return count_chunks(((record, None, chunk) for record, chunk in chunks), k, counts)
+
+
+# Group a (record_no, name, chunk) stream into (pieces, carry) tasks of about
+# task_bases bases. Long records are split between tasks, with the bases a
+# codon or k-mer still needs from before the split passed along as `carry`,
+# so no task ever holds more than about task_bases + one chunk.
+def batch_chunks(chunks, k=0, task_bases=BATCH_TASK_BASES):
+    keep = max(k - 1, 2)
+    task, size, carry = [], 0, None
+    split = current = None
+    tail, length = "", 0
+    for record, _, chunk in chunks:
+        if record != current:
+            current, tail, length = record, "", 0
+        if not task and split is not None:
+            carry = split[1] if split[0] == record else None
+        task.append((record, chunk))
+        size += len(chunk)
+        length += len(chunk)
+        tail = (tail + chunk[-keep:])[-keep:]
+        if size >= task_bases:
+            yield task, carry
+            codon_carry = tail[len(tail) - length % 3:] if length % 3 else ""
+            split = (record, (codon_carry, tail[-(k - 1):] if k > 1 else ""))
+            task, size = [], 0
+    if task:
+        yield task, carry
+
+
+# Count a (record_no, name, chunk) stream across a process pool and merge the
+# partial counts; records are split into tasks, so memory stays bounded
+def count_batch(chunks, k=0, workers=None, task_bases=BATCH_TASK_BASES):
+    workers = workers or os.cpu_count() or 1
+    total = SequenceCounts(k)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for task, carry in batch_chunks(chunks, k, task_bases):
+            pending.append(pool.submit(count_task, task, k, carry))
+            while len(pending) >= workers * 4 or (pending and pending[0].done()):
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+
+# Print codon usage, amino acid composition and the top k-mers
+def print_counts(counts, table=1, one_letter=False, top=10):
+    print(f"Records: {counts.records}, bases: {counts.bases}")
+    print("\n--- CODON USAGE ---")
+    total = sum(int(c) for c in counts.codons) or 1
+    names = codon_labels(table, one_letter)
+    for codon, count in counts.codon_usage().items():
+        print(f"{codon} ({names[codon]}): {count} ({count / total:.2%})")
+    print("\n--- AMINO ACID COMPOSITION ---")
+    for amino, count in sorted(counts.amino_acid_composition(table, one_letter).items(), key=lambda a: -a[1]):
+        print(f"{amino}: {count} ({count / total:.2%})")
+    if counts.k:
+        print(f"\n--- TOP {top} {counts.k}-MERS ---")
+        for kmer, count in counts.most_common_kmers(top):
+            print(f"{kmer}: {count}")
+
+
+# ---------- BATCH TRANSLATION (PROCESS POOL) ----------
+
+# Group (name, dna) records into tasks of about task_bases bases, so many
+# small transcripts travel to a worker together instead of one IPC call each
+def batch_records(records, task_bases=BATCH_TASK_BASES):
+    batch, size = [], 0
+    for record in records:
+        batch.append(record)
+        size += len(record[1])
+        if size >= task_bases:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+# Worker: translate one task and report how long it took
+def translate_task(records, to_stop=True, backend="python", table=1, one_letter=False):
+    start = time.perf_counter()
+    results = [(name, rna_to_protein(dna_to_rna(dna.upper()), to_stop, backend, table, one_letter))
+               for name, dna in records]
+    stats = {
+        "pid": os.getpid(),
+        "records": len(records),
+        "bases": sum(len(dna) for _, dna in records),
+        "seconds": time.perf_counter() - start,
+    }
+    return results, stats
+
+
+# Translate (name, dna) records across a process pool, yielding (name, protein)
+# in input order. At most `workers * 4` tasks are in flight, so records can be
+# streamed in. worker_stats (a dict) collects records/bases/seconds per worker pid.
+def translate_batch(records, workers=None, task_bases=BATCH_TASK_BASES, to_stop=True,
+                    backend="python", worker_stats=None, table=1, one_letter=False):
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for task in batch_records(records, task_bases):
+            pending.append(pool.submit(translate_task, task, to_stop, backend, table, one_letter))
+            while len(pending) >= workers * 4 or (pending and pending[0].done()):
+                yield from _collect(pending.popleft(), worker_stats)
+        while pending:
+            yield from _collect(pending.popleft(), worker_stats)
+
+
+def _collect(future, worker_stats):
+    results, stats = future.result()
+    if worker_stats is not None:
+        totals = worker_stats.setdefault(stats["pid"], {"tasks": 0, "records": 0, "bases": 0, "seconds": 0.0})
+        totals["tasks"] += 1
+        for key in ("records", "bases", "seconds"):
+            totals[key] += stats[key]
+    return results
+
+
+def format_rate(count, seconds):
+    return f"{count / seconds:,.0f}" if seconds > 0 else "n/a"
+
 
 # ---------- SAMPLE RUN ----------
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="DNA → RNA Converter + Codon Translator")
+    parser.add_argument("--stream", metavar="FILE",
+                        help="Translate every record of a FASTA/FASTQ file ('-' for stdin)")
+    parser.add_argument("--orfs", metavar="FILE",
+                        help="List the six-frame ATG→STOP ORFs of every record in a FASTA/FASTQ file")
+    parser.add_argument("--min-length", type=int, default=0,
+                        help="Shortest ORF to report with --orfs, in bases (default: %(default)s)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Translate every record of a FASTA/FASTQ file across a process pool")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --batch (default: one per CPU)")
+    parser.add_argument("--task-bases", type=int, default=BATCH_TASK_BASES,
+                        help="Bases grouped into one --batch task (default: %(default)s)")
+    parser.add_argument("--validate", metavar="FILE",
+                        help="Report every invalid base in a raw DNA file (memory-mapped)")
+    parser.add_argument("--transcribe", metavar="FILE",
+                        help="Validate a raw DNA file, then write its RNA to --output (memory-mapped)")
+    parser.add_argument("--count", metavar="FILE",
+                        help="Report codon usage, amino acid composition and k-mer counts for a FASTA/FASTQ file")
+    parser.add_argument("-k", type=int, default=0,
+                        help=f"k-mer length for --count, up to {MAX_K} (default: no k-mers)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Most frequent k-mers to list with --count (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="Write proteins to this file instead of stdout")
+    parser.add_argument("--format", choices=["fasta", "fastq"],
+                        help="Input format (default: guessed from the file name)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Characters read per block (default: %(default)s)")
+    parser.add_argument("--through-stops", action="store_true",
+                        help="Keep translating past STOP codons")
+    parser.add_argument("--backend", choices=BACKENDS, default="python",
+                        help="Codon lookup implementation (default: %(default)s)")
+    parser.add_argument("--table", type=int, choices=sorted(GENETIC_CODES),
+                        help="NCBI genetic code (default: 1, standard code; --orfs then uses "
+                             "the table's start and stop codons instead of ATG→TAA/TAG/TGA)")
+    parser.add_argument("--one-letter", action="store_true",
+                        help="Write one-letter amino acid codes")
+
+    args = parser.parse_args()
+    orf_table, args.table = args.table, args.table or 1
+
+    # Streaming mode
+    if args.stream:
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            stats = translate_file(args.stream, out, args.format, args.chunk_size,
+                                   not args.through_stops, args.backend, args.table, args.one_letter)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        seconds = stats["seconds"]
+        print(f"Translated {stats['records']} records ({stats['bases']} bases) in {seconds:.2f}s — "
+              f"{format_rate(stats['records'], seconds)} records/s, "
+              f"{format_rate(stats['bases'], seconds)} bases/s", file=sys.stderr)
+        return
+
+    # Memory-mapped validation / transcription
+    if args.validate or args.transcribe:
+        path = args.validate or args.transcribe
+        if args.transcribe and not args.output:
+            parser.error("--transcribe needs --output")
+        invalid = 0
+        for offset, char in iter_invalid_bases(path, args.chunk_size):
+            print(f"Invalid base {char!r} at offset {offset}")
+            invalid += 1
+        if invalid:
+            print(f"Invalid DNA sequence! ({invalid} invalid bases)")
+            sys.exit(1)
+        if args.validate:
+            print("Valid DNA sequence.")
+            return
+        start = time.perf_counter()
+        written = transcribe_file(path, args.output, args.chunk_size)
+        seconds = time.perf_counter() - start
+        print(f"Wrote {written} bytes of RNA to {args.output} in {seconds:.2f}s "
+              f"({format_rate(written, seconds)} bytes/s)")
+        return
+
+    # Counting mode (parallel when --workers is given)
+    if args.count:
+        handle = open_sequence_file(args.count)
+        fmt = args.format or detect_format(args.count)
+        start = time.perf_counter()
+        try:
+            if args.workers:
+                counts = count_batch(read_sequence_chunks(handle, fmt, args.chunk_size), args.k,
+                                     args.workers, args.task_bases)
+            else:
+                counts = count_chunks(read_sequence_chunks(handle, fmt, args.chunk_size), args.k)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+        seconds = time.perf_counter() - start
+        print_counts(counts, args.table, args.one_letter, args.top)
+        print(f"\nCounted {counts.bases} bases in {seconds:.2f}s ({format_rate(counts.bases, seconds)} bases/s)",
+              file=sys.stderr)
+        return
+
+    # Batch mode
+    if args.batch:
+        out = open(args.output, "w") if args.output else sys.stdout
+        handle = open_sequence_file(args.batch)
+        worker_stats = {}
+        start = time.perf_counter()
+        try:
+            records = read_records(handle, args.format or detect_format(args.batch), args.chunk_size)
+            translated = translate_batch(records, args.workers, args.task_bases,
+                                         not args.through_stops, args.backend, worker_stats,
+                                         args.table, args.one_letter)
+            write_proteins(out, ((name, [protein]) for name, protein in translated),
+                           "" if args.one_letter else "-")
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+            if out is not sys.stdout:
+                out.close()
+        seconds = time.perf_counter() - start
+        for pid, totals in sorted(worker_stats.items()):
+            print(f"worker {pid}: {totals['tasks']} tasks, {totals['records']} records, "
+                  f"{format_rate(totals['bases'], totals['seconds'])} bases/s", file=sys.stderr)
+        records = sum(totals["records"] for totals in worker_stats.values())
+        bases = sum(totals["bases"] for totals in worker_stats.values())
+        print(f"Translated {records} records ({bases} bases) in {seconds:.2f}s — "
+              f"{format_rate(records, seconds)} records/s, {format_rate(bases, seconds)} bases/s",
+              file=sys.stderr)
+        return
+
+    # ORF listing mode
+    if args.orfs:
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            count = write_orfs_file(args.orfs, out, args.format, args.min_length, orf_table)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"Found {count} ORFs", file=sys.stderr)
+        return
+
+    # Interactive mode
     dna = input("Enter DNA sequence (A,T,G,C only): ").upper()
 
     if not is_valid_dna(dna):
@@ -74,9 +1242,12 @@ if __name__ == "__main__":
         rna = dna_to_rna(dna)
         print("RNA Sequence:", rna)
 
-        protein = rna_to_protein(rna)
-        print("Amino Acid Sequence:", "-".join(protein))
+        protein = rna_to_protein(rna, table=args.table, one_letter=args.one_letter)
+        print("Amino Acid Sequence:", ("" if args.one_letter else "-").join(protein))
 
         print("\n--- CODON TABLE ---")
-        print_codon_table()
+        print_codon_table(args.table, args.one_letter)
 
+
+if __name__ == "__main__":
+    main()
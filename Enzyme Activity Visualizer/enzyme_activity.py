@@ -1,5 +1,41 @@
+"""
+Enzyme Activity Visualizer
+--------------------------
+Gaussian models of enzyme activity vs temperature and pH, with plots.
+
+Usage:
+$ python enzyme_activity.py                                  # show all plots in windows
+$ python enzyme_activity.py --output figures --format svg    # write files, no windows
+$ python enzyme_activity.py --plots heatmap contour --temp-optimum 60 --output figures
+$ python enzyme_activity.py --batch enzymes.csv --output figures --workers 4  # many enzymes in parallel
+$ python enzyme_activity.py --fit measurements.csv --fit-output fits.csv   # estimate optimum/width per enzyme
+$ python enzyme_activity.py --kinetics conditions.csv --adaptive           # Michaelis-Menten time courses
+
+Can also be imported: cached_grid() returns the temperature x pH activity grid
+(memoized per parameter set), render() draws any of the PLOTS and fit_curves()
+estimates optimum and width for many enzymes from measured data in one batch.
+simulate_kinetics() integrates substrate depletion for a batch of conditions.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+TEMP_RANGE = (0.0, 80.0)
+PH_RANGE = (0.0, 14.0)
+RESOLUTION = 400
+PLOTS = ("temperature", "ph", "heatmap", "surface", "contour")
+FORMATS = ("png", "svg")
 
 # --- Enzyme activity model functions ---
 
@@ -13,77 +49,772 @@ def enzyme_activity_pH(ph, optimum=7, width=1.5):
     return np.exp(-((ph - optimum) ** 2) / (2 * width ** 2))
 
 
-# --- Temperature Curve ---
+def activity_grid(temp, ph, temp_optimum=37, temp_width=10, ph_optimum=7, ph_width=1.5):
+    """Combined activity for every (temperature, pH) pair: rows = temp, columns = pH."""
+    return (enzyme_activity_temp(temp[:, None], temp_optimum, temp_width)
+            * enzyme_activity_pH(ph[None, :], ph_optimum, ph_width))
+
+# --- Cached grids ---
+
+@lru_cache(maxsize=None)
+def cached_axis(start, stop, resolution=RESOLUTION):
+    """np.linspace(start, stop, resolution), built once and read-only."""
+    axis = np.linspace(start, stop, resolution)
+    axis.flags.writeable = False
+    return axis
+
+
+@lru_cache(maxsize=None)
+def cached_curve(kind, optimum, width, value_range, resolution=RESOLUTION):
+    """(x, activity) for the "temp" or "ph" curve, memoized by its parameters."""
+    x = cached_axis(*value_range, resolution)
+    model = enzyme_activity_temp if kind == "temp" else enzyme_activity_pH
+    activity = model(x, optimum, width)
+    activity.flags.writeable = False
+    return x, activity
+
+
+@lru_cache(maxsize=32)
+def cached_grid(temp_optimum=37, temp_width=10, ph_optimum=7, ph_width=1.5,
+                temp_range=TEMP_RANGE, ph_range=PH_RANGE, resolution=RESOLUTION):
+    """(temp, ph, grid) for one parameter set, computed once and shared read-only.
+
+    The grid is the outer product of the two cached 1-D curves, so asking for a
+    new pH optimum reuses the temperature curve and vice versa.
+    """
+    temp, temp_activity = cached_curve("temp", temp_optimum, temp_width, tuple(temp_range), resolution)
+    ph, ph_activity = cached_curve("ph", ph_optimum, ph_width, tuple(ph_range), resolution)
+    grid = np.multiply.outer(temp_activity, ph_activity)
+    grid.flags.writeable = False
+    return temp, ph, grid
+
+# --- Plots ---
+
+def new_figure(figsize, interactive):
+    """A pyplot figure for on-screen display, or a plain Agg-backed Figure for files."""
+    if interactive:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def plot_temperature(fig, params):
+    temp, activity = cached_curve("temp", params["temp_optimum"], params["temp_width"],
+                                  params["temp_range"], params["resolution"])
+    ax = fig.add_subplot(111)
+    ax.plot(temp, activity)
+    ax.set_title("Enzyme Activity vs Temperature")
+    ax.set_xlabel("Temperature (°C)")
+    ax.set_ylabel("Relative Activity")
+    ax.grid(True)
+
+
+def plot_ph(fig, params):
+    ph, activity = cached_curve("ph", params["ph_optimum"], params["ph_width"],
+                                params["ph_range"], params["resolution"])
+    ax = fig.add_subplot(111)
+    ax.plot(ph, activity)
+    ax.set_title("Enzyme Activity vs pH")
+    ax.set_xlabel("pH Level")
+    ax.set_ylabel("Relative Activity")
+    ax.grid(True)
+
+
+def plot_heatmap(fig, params):
+    temp, ph, grid = cached_grid(**params)
+    ax = fig.add_subplot(111)
+    image = ax.imshow(grid, extent=[ph[0], ph[-1], temp[0], temp[-1]], origin='lower', aspect='auto',
+                      cmap='viridis')
+    fig.colorbar(image, ax=ax, label='Relative Activity')
+    ax.set_title("Enzyme Activity vs Temperature and pH")
+    ax.set_xlabel("pH Level")
+    ax.set_ylabel("Temperature (°C)")
+
+
+def plot_surface(fig, params):
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers the 3d projection on old Matplotlib)
+    temp, ph, grid = cached_grid(**params)
+    temp_grid, ph_grid = np.meshgrid(temp, ph)
+    ax = fig.add_subplot(111, projection='3d')
+    ax.plot_surface(temp_grid, ph_grid, grid.T, cmap='viridis')
+    ax.set_title("3D Surface Plot of Enzyme Activity")
+    ax.set_xlabel("Temperature (°C)")
+    ax.set_ylabel("pH Level")
+    ax.set_zlabel("Relative Activity")
+
+
+def plot_contour(fig, params):
+    temp, ph, grid = cached_grid(**params)
+    ax = fig.add_subplot(111)
+    contour = ax.contourf(ph, temp, grid, levels=50, cmap='viridis')
+    fig.colorbar(contour, ax=ax, label='Relative Activity')
+    ax.set_title("Contour Plot of Enzyme Activity")
+    ax.set_xlabel("pH Level")
+    ax.set_ylabel("Temperature (°C)")
+
+
+PLOT_FUNCTIONS = {
+    "temperature": (plot_temperature, (7, 4)),
+    "ph": (plot_ph, (7, 4)),
+    "heatmap": (plot_heatmap, (8, 6)),
+    "surface": (plot_surface, (10, 7)),
+    "contour": (plot_contour, (8, 6)),
+}
+
+
+def enzyme_params(temp_optimum=37, temp_width=10, ph_optimum=7, ph_width=1.5,
+                  temp_range=TEMP_RANGE, ph_range=PH_RANGE, resolution=RESOLUTION):
+    """Parameter set in the form the plot functions and cached_grid() take (ranges as tuples)."""
+    return {"temp_optimum": temp_optimum, "temp_width": temp_width,
+            "ph_optimum": ph_optimum, "ph_width": ph_width,
+            "temp_range": tuple(temp_range), "ph_range": tuple(ph_range), "resolution": resolution}
+
+
+def render(plots=PLOTS, params=None, output_dir=None, fmt="png", dpi=100, prefix=""):
+    """Draw the requested plots only.
+
+    With output_dir, each plot is written to <output_dir>/<prefix><plot>.<fmt>
+    without opening a window (Agg rendering, works on headless servers) and the
+    file paths are returned. Without it, the figures are shown on screen.
+    """
+    params = params or enzyme_params()
+    interactive = output_dir is None
+    paths = []
+    if not interactive:
+        os.makedirs(output_dir, exist_ok=True)
+    for name in plots:
+        draw, figsize = PLOT_FUNCTIONS[name]
+        fig = new_figure(figsize, interactive)
+        draw(fig, params)
+        if not interactive:
+            path = os.path.join(output_dir, f"{prefix}{name}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi)
+            paths.append(path)
+    if interactive:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return paths
+
+
+# --- Batch rendering ---
+
+BATCH_COLUMNS = ("temp_optimum", "temp_width", "ph_optimum", "ph_width", "resolution")
+RENDER_CACHE = ".render_cache.json"
+RENDER_CACHE_VERSION = 1  # bump when the plot functions change so cached figures are redrawn
+
+
+def read_enzyme_table(path):
+    """Reads (name, params) pairs from a CSV with an enzyme column and any of BATCH_COLUMNS.
+
+    Missing columns or empty cells fall back to the enzyme_params() defaults;
+    a cell that is not a number raises ValueError naming the file, line and column.
+    """
+    table = []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            row = {key.strip().lower(): value.strip() for key, value in row.items() if key}
+            if "enzyme" not in row:
+                raise ValueError(f"{path}: needs an 'enzyme' column")
+            values = {}
+            for key in BATCH_COLUMNS:
+                if row.get(key):
+                    try:
+                        values[key] = float(row[key])
+                    except ValueError:
+                        raise ValueError(f"{path}: line {reader.line_num}: {key} must be a number, "
+                                         f"got {row[key]!r}") from None
+            if "resolution" in values:
+                values["resolution"] = int(values["resolution"])
+            table.append((row["enzyme"], enzyme_params(**values)))
+    return table
+
+
+def figure_key(plot, params, fmt, dpi):
+    """Hash of everything that affects one figure's output file."""
+    payload = json.dumps([RENDER_CACHE_VERSION, plot, sorted(params.items()), fmt, dpi])
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "enzyme"
+
+
+def _init_render_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_job(job):
+    name, plots, params, output_dir, fmt, dpi = job
+    return render(plots, params, output_dir, fmt, dpi, prefix=f"{name}_")
+
+
+def render_batch(table, output_dir, plots=PLOTS, fmt="png", dpi=100, workers=None, force=False):
+    """Renders every plot for every (name, params) pair in table into output_dir.
+
+    Files are named <enzyme>_<plot>.<fmt>, with characters other than letters,
+    digits, "." and "-" in the name replaced by "_"; two enzymes that end up with
+    the same file name, ignoring case (as macOS and Windows do), raise ValueError. A figure whose parameter hash matches the
+    one recorded in output_dir/.render_cache.json on the previous run, and whose
+    file still exists, is skipped unless force is set. Each enzyme's remaining plots
+    form one job, so its grid is computed once per worker process; jobs run
+    across a process pool of `workers` (default: all CPUs, 1 = no pool).
+
+    Only figures a job reports as written are recorded in the cache, so a failed
+    re-render never marks an old file as up to date.
+
+    Returns (figures rendered, figures skipped, seconds).
+    """
+    safe_names = {}
+    for name, _ in table:
+        safe = _safe_name(name)
+        if safe.lower() in safe_names:
+            raise ValueError(f"Enzymes {safe_names[safe.lower()]!r} and {name!r} would both be saved as "
+                             f"{safe}_<plot>; rename one of them")
+        safe_names[safe.lower()] = name
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, RENDER_CACHE)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    jobs, pending, skipped = [], {}, 0
+    for name, params in table:
+        name = _safe_name(name)
+        stale = []
+        for plot in plots:
+            filename = f"{name}_{plot}.{fmt}"
+            key = figure_key(plot, params, fmt, dpi)
+            if not force and cache.get(filename) == key and os.path.exists(os.path.join(output_dir, filename)):
+                skipped += 1
+                continue
+            stale.append(plot)
+            pending[filename] = key
+        if stale:
+            jobs.append((name, tuple(stale), params, output_dir, fmt, dpi))
+
+    workers = workers or os.cpu_count() or 1
+    written = []
+    try:
+        if workers == 1 or len(jobs) <= 1:
+            # render() with an output_dir already draws on Agg Figures, no backend switch needed here
+            for job in jobs:
+                written.extend(_render_job(job))
+        else:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(workers, initializer=_init_render_worker) as pool:
+                for paths in pool.map(_render_job, jobs, chunksize=chunksize):
+                    written.extend(paths)
+    finally:
+        cache.update((os.path.basename(path), pending[os.path.basename(path)]) for path in written)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=0, sort_keys=True)
+        os.replace(tmp, cache_path)
+    return len(written), skipped, time.perf_counter() - start
+
+
+def batch_main(path, output_dir, plots, fmt, dpi, workers, force):
+    try:
+        table = read_enzyme_table(path)
+        rendered, skipped, elapsed = render_batch(table, output_dir, plots, fmt, dpi, workers, force)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"{len(table):,} enzymes: rendered {rendered:,} figures, {skipped:,} unchanged and skipped")
+    print(f"Took {elapsed:.2f}s ({rendered / max(elapsed, 1e-9):,.1f} figures/s) -> {output_dir}")
+
+
+# --- Fitting measured data ---
+
+FIT_COLUMNS = {"temp": "temp", "temperature": "temp", "ph": "ph"}
+FIT_MAX_ITER = 50
+FIT_TOL = 1e-10
+FIT_LOG_FLOOR = 0.05
+
+FitResult = namedtuple("FitResult", "enzymes variable peak optimum width peak_err optimum_err width_err "
+                                    "rmse n_points converged")
+
+
+def read_measurements(path):
+    """Reads a long-format CSV with columns enzyme, temp (or temperature, or ph) and activity.
+
+    Returns (enzyme names, x, activity, variable) where variable is "temp" or "ph".
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        try:
+            name_col, activity_col = header.index("enzyme"), header.index("activity")
+        except ValueError:
+            raise ValueError(f"{path}: needs 'enzyme' and 'activity' columns, got {header}") from None
+        x_cols = [i for i, name in enumerate(header) if name in FIT_COLUMNS]
+        if len(x_cols) != 1:
+            raise ValueError(f"{path}: needs exactly one of the columns temp, temperature or ph")
+        x_col = x_cols[0]
+        names, x, activity = [], [], []
+        for row in reader:
+            if row:
+                names.append(row[name_col])
+                x.append(row[x_col])
+                activity.append(row[activity_col])
+    return (np.array(names), np.array(x, dtype=float), np.array(activity, dtype=float),
+            FIT_COLUMNS[header[x_col]])
+
+
+def _group_sums(group, n_groups, *values):
+    """Per-group sums of each array (np.bincount), stacked on the last axis."""
+    return np.stack([np.bincount(group, weights=v, minlength=n_groups) for v in values], axis=-1)
+
+
+def _solve3(a, b):
+    """Solves a batch of 3x3 systems a @ p = b, nudging singular ones with a small ridge."""
+    ridge = 1e-12 * np.maximum(np.trace(a, axis1=1, axis2=2), 1e-300)
+    a = a + ridge[:, None, None] * np.eye(3)
+    try:
+        return np.linalg.solve(a, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("nij,nj->ni", np.linalg.pinv(a), b)
+
+
+def initial_estimates(group, x, y, n_groups):
+    """Closed-form start values (peak, optimum, width) for every group at once.
+
+    log(y) of a Gaussian is a parabola, so a weighted quadratic fit of log(y) on x
+    gives all three parameters. Points below FIT_LOG_FLOOR of the group's highest
+    activity are left out and the rest weighted by y**2, so the noise floor does
+    not dominate. Groups whose parabola does not open downwards, or puts the
+    optimum outside the measured range, fall back to the highest point and a
+    quarter of the range.
+    """
+    centre = _group_sums(group, n_groups, x)[:, 0] / np.bincount(group, minlength=n_groups)
+    top = np.full(n_groups, -np.inf)
+    np.maximum.at(top, group, y)
+    ok = y > FIT_LOG_FLOOR * top[group]
+    g, dx, w = group[ok], x[ok] - centre[group[ok]], y[ok] ** 2
+    log_y = np.log(y[ok])
+    s = _group_sums(g, n_groups, w, w * dx, w * dx ** 2, w * dx ** 3, w * dx ** 4,
+                    w * log_y, w * dx * log_y, w * dx ** 2 * log_y)
+    normal = s[:, [0, 1, 2, 1, 2, 3, 2, 3, 4]].reshape(-1, 3, 3)
+    c0, c1, c2 = _solve3(normal, s[:, 5:]).T
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        optimum = centre - c1 / (2 * c2)
+        width = np.sqrt(-1 / (2 * c2))
+        peak = np.exp(c0 - c1 ** 2 / (4 * c2))
+
+    order = np.lexsort((-y, group))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = group[order][1:] != group[order][:-1]
+    best = np.full(n_groups, -1)
+    best[group[order][first]] = order[first]
+    lo = np.full(n_groups, np.inf)
+    hi = np.full(n_groups, -np.inf)
+    np.minimum.at(lo, group, x)
+    np.maximum.at(hi, group, x)
+
+    with np.errstate(invalid="ignore"):
+        bad = ~((c2 < 0) & (optimum >= lo) & (optimum <= hi) & (width <= hi - lo) & np.isfinite(peak))
+    optimum[bad] = x[best[bad]]
+    peak[bad] = y[best[bad]]
+    width[bad] = np.maximum((hi[bad] - lo[bad]) / 4, 1e-6)
+    return np.stack([peak, optimum, width], axis=1)
+
+
+def _residuals(params, group, x, y):
+    peak, optimum, width = params[group].T
+    d = x - optimum
+    g = np.exp(-d ** 2 / (2 * width ** 2))
+    return y - peak * g, g, d, peak, width
+
+
+def fit_curves(enzymes, x, activity, variable="temp", max_iter=FIT_MAX_ITER, tol=FIT_TOL):
+    """Fits peak * exp(-(x - optimum)**2 / (2 * width**2)) to every enzyme in one batch.
+
+    enzymes, x and activity are equal-length 1-D arrays in long format (one row per
+    measurement). All enzymes are solved together: log-quadratic start values,
+    then Gauss-Newton steps whose 3x3 normal equations are summed per enzyme with
+    np.bincount and solved as one stacked system. A step that makes an enzyme's
+    fit worse is halved for that enzyme only, and enzymes that have converged
+    drop out of later iterations.
+
+    Standard errors come from the covariance s**2 * inv(J.T @ J) at the solution;
+    they are NaN for enzymes with three or fewer measurements.
+    """
+    names, group = np.unique(np.asarray(enzymes), return_inverse=True)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(activity, dtype=float)
+    n_groups = len(names)
+    counts = np.bincount(group, minlength=n_groups)
+
+    params = initial_estimates(group, x, y, n_groups)
+    sse = _group_sums(group, n_groups, _residuals(params, group, x, y)[0] ** 2)[:, 0]
+    converged = np.zeros(n_groups, dtype=bool)
+    active = counts >= 3
+
+    for _ in range(max_iter):
+        ids = np.flatnonzero(active)
+        if not len(ids):
+            break
+        local = np.full(n_groups, -1)
+        local[ids] = np.arange(len(ids))
+        rows = active[group]
+        g_idx, gx, gy = local[group[rows]], x[rows], y[rows]
+        p = params[ids]
+
+        r, g, d, peak, width = _residuals(p, g_idx, gx, gy)
+        jac = (g, peak * g * d / width ** 2, peak * g * d ** 2 / width ** 3)
+        jtj = _group_sums(g_idx, len(ids), *(jac[i] * jac[j] for i in range(3) for j in range(3)))
+        jtr = _group_sums(g_idx, len(ids), *(j * r for j in jac))
+        step = _solve3(jtj.reshape(-1, 3, 3), jtr)
+
+        old_sse = sse[ids]
+        new_sse = np.full(len(ids), np.inf)
+        trial = p
+        pending = np.ones(len(ids), dtype=bool)
+        scale = 1.0
+        for _ in range(20):
+            candidate = p + scale * step
+            candidate[:, 2] = np.abs(candidate[:, 2])
+            res = _residuals(candidate, g_idx, gx, gy)[0]
+            cand_sse = _group_sums(g_idx, len(ids), res ** 2)[:, 0]
+            better = pending & np.isfinite(cand_sse) & (cand_sse <= old_sse)
+            trial = np.where(better[:, None], candidate, trial)
+            new_sse = np.where(better, cand_sse, new_sse)
+            pending &= ~better
+            if not pending.any():
+                break
+            scale /= 2
+        new_sse = np.where(pending, old_sse, new_sse)
+
+        params[ids] = trial
+        sse[ids] = new_sse
+        done = (old_sse - new_sse <= tol * (old_sse + tol)) | pending
+        converged[ids[done]] = True
+        active[ids[done]] = False
+
+    r, g, d, peak, width = _residuals(params, group, x, y)
+    jac = (g, peak * g * d / width ** 2, peak * g * d ** 2 / width ** 3)
+    jtj = _group_sums(group, n_groups, *(jac[i] * jac[j] for i in range(3) for j in range(3)))
+    dof = counts - 3
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.where(dof > 0, sse / dof, np.nan)
+        cov = np.linalg.pinv(jtj.reshape(-1, 3, 3)) * variance[:, None, None]
+        errors = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+        rmse = np.sqrt(sse / counts)
+    params[counts < 3] = np.nan
+    rmse[counts < 3] = np.nan
+
+    return FitResult(names, variable, params[:, 0], params[:, 1], params[:, 2],
+                     errors[:, 0], errors[:, 1], errors[:, 2], rmse, counts, converged)
+
+
+def write_fits(result, path):
+    """Writes one CSV row per enzyme: estimates, standard errors and fit quality."""
+    unit = "C" if result.variable == "temp" else "pH"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["enzyme", f"optimum_{unit}", "optimum_err", "width", "width_err",
+                         "peak", "peak_err", "rmse", "n_points", "converged"])
+        for row in zip(result.enzymes, result.optimum, result.optimum_err, result.width,
+                       result.width_err, result.peak, result.peak_err, result.rmse,
+                       result.n_points, result.converged):
+            writer.writerow([row[0]] + [f"{v:.6g}" for v in row[1:8]] + [int(row[8]), int(row[9])])
+
+
+# --- Reaction kinetics ---
+
+KINETICS_COLUMNS = ("temp", "ph", "s0", "vmax", "km")
+KINETICS_T_END = 60.0
+KINETICS_SAMPLES = 61
+KINETICS_MEMORY_MB = 256
+KINETICS_RTOL = 1e-6
+KINETICS_ATOL = 1e-9
+KINETICS_MAX_SUBSTEPS = 1 << 14  # lower bound on the fixed step: interval / KINETICS_MAX_SUBSTEPS
+
+
+def effective_vmax(temp, ph, vmax, temp_optimum=37, temp_width=10, ph_optimum=7, ph_width=1.5):
+    """Vmax scaled by the temperature and pH activity curves."""
+    return (vmax * enzyme_activity_temp(temp, temp_optimum, temp_width)
+            * enzyme_activity_pH(ph, ph_optimum, ph_width))
+
+
+def _mm_rate(s, v, km):
+    """dS/dt for Michaelis-Menten kinetics."""
+    return -v * s / (km + s)
+
+
+def _rk4_step(s, h, v, km):
+    k1 = _mm_rate(s, v, km)
+    k2 = _mm_rate(s + h / 2 * k1, v, km)
+    k3 = _mm_rate(s + h / 2 * k2, v, km)
+    k4 = _mm_rate(s + h * k3, v, km)
+    return np.maximum(s + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4), 0.0)
+
+
+def _bs23_step(s, h, v, km):
+    """Bogacki-Shampine step: third-order result and the second-order one for its error."""
+    k1 = _mm_rate(s, v, km)
+    k2 = _mm_rate(s + h / 2 * k1, v, km)
+    k3 = _mm_rate(s + 3 * h / 4 * k2, v, km)
+    high = s + h * (2 * k1 + 3 * k2 + 4 * k3) / 9
+    k4 = _mm_rate(high, v, km)
+    low = s + h * (7 * k1 / 24 + k2 / 4 + k3 / 3 + k4 / 8)
+    return np.maximum(high, 0.0), np.abs(high - low)
+
+
+def _crossing(t, before, level, v, km):
+    """When S, at `before` at time t, reaches `level`.
+
+    Michaelis-Menten integrates exactly in t(S): Km ln(S1/S2) + (S1 - S2) = V dt,
+    so inside the step that crossed the level this is exact, not an interpolation.
+    """
+    return t + (km * np.log(before / level) + before - level) / v
+
+
+def _rk4_run(s0, v, km, times, steps):
+    """Fixed-step RK4 with `steps` substeps per sampling interval; returns (substrate, t_half)."""
+    h = (times[1] - times[0]) / steps
+    substrate = np.empty((len(s0), len(times)))
+    substrate[:, 0] = s0
+    t_half = np.full(len(s0), np.nan)
+    half = s0 / 2
+    s = s0.copy()
+    for k in range(1, len(times)):
+        t = times[k - 1]
+        for _ in range(steps):
+            new = _rk4_step(s, h, v, km)
+            crossed = (s > half) & (new <= half)
+            if crossed.any():
+                t_half[crossed] = _crossing(t, s[crossed], half[crossed], v[crossed], km[crossed])
+            s = new
+            t += h
+        substrate[:, k] = s
+    return substrate, t_half
+
+
+def simulate_kinetics(temp, ph, s0, vmax, km, t_end=KINETICS_T_END, samples=KINETICS_SAMPLES, dt=None,
+                      adaptive=False, rtol=KINETICS_RTOL, atol=KINETICS_ATOL,
+                      temp_optimum=37, temp_width=10, ph_optimum=7, ph_width=1.5):
+    """Integrates dS/dt = -V S / (Km + S) for a batch of conditions at once.
+
+    temp, ph, s0, vmax and km are 1-D arrays (one entry per condition); V is vmax
+    scaled by enzyme_activity_temp x enzyme_activity_pH. Product is s0 - S.
+
+    Fixed-step RK4 by default. Without dt each reaction gets at most a tenth of the
+    sampling interval, or Km / 4V if that is shorter; reactions are grouped by that
+    step (rounded to a power of two), so one stiff condition does not slow down
+    the rest. Substeps per interval are capped at KINETICS_MAX_SUBSTEPS.
+    With adaptive=True every condition gets its own Bogacki-Shampine step size,
+    kept within rtol/atol, so fast and slow reactions share a batch without the
+    fast ones forcing a tiny step on everyone.
+
+    Returns (times, substrate, t_half): the `samples` output times, substrate at
+    those times (conditions x samples) and the time S first reached s0 / 2 (NaN if
+    it did not within t_end), exact within the step where the crossing happened.
+    Raises ValueError if any km is not positive.
+    """
+    s0 = np.asarray(s0, dtype=float)
+    km = np.asarray(km, dtype=float)
+    if np.any(~(km > 0)):
+        raise ValueError("km must be positive for every condition")
+    if dt is not None and not dt > 0:
+        raise ValueError("dt must be positive")
+    v = effective_vmax(np.asarray(temp, dtype=float), np.asarray(ph, dtype=float),
+                       np.asarray(vmax, dtype=float), temp_optimum, temp_width, ph_optimum, ph_width)
+    n = len(s0)
+    times = np.linspace(0.0, t_end, samples)
+    substrate = np.empty((n, samples))
+    substrate[:, 0] = s0
+    t_half = np.full(n, np.nan)
+    half = s0 / 2
+    if samples < 2:
+        return times, substrate, t_half
 
-temp = np.linspace(0, 80, 400)
-activity_temp = enzyme_activity_temp(temp)
+    if not adaptive:
+        interval = times[1] - times[0]
+        if dt is not None:
+            steps = np.full(n, np.ceil(interval / dt))
+        else:
+            # RK4 goes unstable once h * V / Km nears 2.8; h <= Km / 4V also keeps it accurate
+            with np.errstate(divide="ignore"):
+                steps = np.ceil(interval / np.minimum(interval / 10, km / (4 * np.maximum(v, 1e-300))))
+            # round up to powers of two so a batch splits into a few stiffness groups
+            steps = 2.0 ** np.ceil(np.log2(np.maximum(steps, 1)))
+        steps = np.clip(steps, 1, KINETICS_MAX_SUBSTEPS).astype(np.int64)
+        for group_steps in np.unique(steps):
+            group = np.flatnonzero(steps == group_steps)
+            substrate[group], t_half[group] = _rk4_run(s0[group], v[group], km[group], times, int(group_steps))
+        return times, substrate, t_half
 
-plt.figure(figsize=(7, 4))
-plt.plot(temp, activity_temp)
-plt.title("Enzyme Activity vs Temperature")
-plt.xlabel("Temperature (°C)")
-plt.ylabel("Relative Activity")
-plt.grid(True)
-plt.show()
+    s = s0.copy()
+    t = np.zeros(n)
+    h = np.full(n, dt or (times[1] - times[0]) / 10)
+    next_k = np.ones(n, dtype=int)
+    active = np.arange(n)
+    while len(active):
+        target = times[next_k[active]]
+        step = np.minimum(h[active], target - t[active])
+        sa = s[active]
+        new, err = _bs23_step(sa, step, v[active], km[active])
+        tol = atol + rtol * np.maximum(np.abs(sa), np.abs(new))
+        ok = err <= tol
+        with np.errstate(divide="ignore"):
+            factor = np.clip(0.9 * (tol / err) ** (1 / 3), 0.2, 3.0)
+        # a step shortened to land on a sample time says little about the next one
+        clipped = ok & (step < h[active])
+        h[active] = np.where(clipped, h[active], step * factor)
 
-# --- pH Curve ---
+        acc = active[ok]
+        before, after, t_acc = sa[ok], new[ok], t[acc]
+        crossed = (before > half[acc]) & (after <= half[acc])
+        if crossed.any():
+            hit = acc[crossed]
+            t_half[hit] = _crossing(t_acc[crossed], before[crossed], half[hit], v[hit], km[hit])
+        s[acc] = after
+        t[acc] = t_acc + step[ok]
 
-ph = np.linspace(0, 14, 400)
-activity_ph = enzyme_activity_pH(ph)
+        reached = acc[t[acc] >= times[next_k[acc]] - 1e-12 * t_end]
+        substrate[reached, next_k[reached]] = s[reached]
+        t[reached] = times[next_k[reached]]
+        next_k[reached] += 1
+        active = active[next_k[active] < samples]
+    return times, substrate, t_half
 
-plt.figure(figsize=(7, 4))
-plt.plot(ph, activity_ph)
-plt.title("Enzyme Activity vs pH")
-plt.xlabel("pH Level")
-plt.ylabel("Relative Activity")
-plt.grid(True)
-plt.show()
 
-# --- Combined Curve ---
+def read_conditions(path):
+    """Yields (temp, ph, s0, vmax, km) tuples from a CSV with those column names."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        missing = [name for name in KINETICS_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+        columns = [header.index(name) for name in KINETICS_COLUMNS]
+        for row in reader:
+            if row:
+                yield tuple(float(row[i]) for i in columns)
 
-combined_activity = enzyme_activity_temp(temp[:, None]) * enzyme_activity_pH(ph[None, :])
-plt.figure(figsize=(8, 6))
-plt.imshow(combined_activity, extent=[0, 14, 0, 80], origin='lower', aspect='auto', cmap='viridis')
-plt.colorbar(label='Relative Activity')
-plt.title("Enzyme Activity vs Temperature and pH")
-plt.xlabel("pH Level")
-plt.ylabel("Temperature (°C)")
-plt.show()
 
-# --- 3D Surface Plot ---
+def kinetics_chunk_size(samples, memory_mb=KINETICS_MEMORY_MB):
+    """How many conditions fit in memory_mb, counting the output row and working arrays."""
+    bytes_per_condition = 8 * (samples + 32)
+    return max(1, int(memory_mb * 2 ** 20 // bytes_per_condition))
 
-from mpl_toolkits.mplot3d import Axes3D
-temp_grid, ph_grid = np.meshgrid(temp, ph)
-fig = plt.figure(figsize=(10, 7))
-ax = fig.add_subplot(111, projection='3d')      
-ax.plot_surface(temp_grid, ph_grid, combined_activity.T, cmap='viridis')
-ax.set_title("3D Surface Plot of Enzyme Activity")
-ax.set_xlabel("Temperature (°C)")
-ax.set_ylabel("pH Level")
-ax.set_zlabel("Relative Activity")
-plt.show()
 
-# --- Contour Plot ---
+def run_kinetics(conditions, output, t_end=KINETICS_T_END, samples=KINETICS_SAMPLES, memory_mb=KINETICS_MEMORY_MB,
+                 **options):
+    """Simulates an iterable of (temp, ph, s0, vmax, km) conditions and streams the results to a CSV.
 
-plt.figure(figsize=(8, 6))
-contour = plt.contourf(ph, temp, combined_activity, levels=50, cmap='viridis')
-plt.colorbar(label='Relative Activity')
-plt.title("Contour Plot of Enzyme Activity")
-plt.xlabel("pH Level")
-plt.ylabel("Temperature (°C)")
-plt.show()
+    Conditions are consumed in chunks sized by kinetics_chunk_size(), so a sweep of
+    any length runs in bounded memory. Each output row holds the condition, the
+    effective Vmax, the half-time, the product formed by t_end and the substrate
+    concentration at every sample time. Returns (conditions simulated, seconds).
+    """
+    chunk_size = kinetics_chunk_size(samples, memory_mb)
+    conditions = iter(conditions)
+    start = time.perf_counter()
+    total = 0
+    times = np.linspace(0.0, t_end, samples)
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(KINETICS_COLUMNS + ("vmax_effective", "t_half", "product_end")
+                         + tuple(f"S_t{t:g}" for t in times)) + "\n")
+        while True:
+            chunk = np.array(list(islice(conditions, chunk_size)), dtype=float).reshape(-1, 5)
+            if not len(chunk):
+                break
+            temp, ph, s0, vmax, km = chunk.T
+            _, substrate, t_half = simulate_kinetics(temp, ph, s0, vmax, km, t_end, samples, **options)
+            curve = {key: options[key] for key in ("temp_optimum", "temp_width", "ph_optimum", "ph_width")
+                     if key in options}
+            summary = np.column_stack([chunk, effective_vmax(temp, ph, vmax, **curve), t_half,
+                                       s0 - substrate[:, -1], substrate])
+            np.savetxt(f, summary, fmt="%.6g", delimiter=",")
+            total += len(chunk)
+    return total, time.perf_counter() - start
 
-# --- Heatmap ---
 
-plt.figure(figsize=(8, 6))  
-plt.imshow(combined_activity, extent=[0, 14, 0, 80], origin='lower', aspect='auto', cmap='viridis')
-plt.colorbar(label='Relative Activity')     
-plt.title("Heatmap of Enzyme Activity")
-plt.xlabel("pH Level")
-plt.ylabel("Temperature (°C)")
-plt.show()
+def fit_main(path, output=None):
+    start = time.perf_counter()
+    result = fit_curves(*read_measurements(path))
+    elapsed = time.perf_counter() - start
+    print(f"Fitted {len(result.enzymes):,} enzymes ({int(result.n_points.sum()):,} measurements) "
+          f"in {elapsed:.2f}s; {int(result.converged.sum()):,} converged")
+    if output:
+        write_fits(result, output)
+        print(f"Saved {output}")
+        return
+    label = "Optimum (°C)" if result.variable == "temp" else "Optimum pH"
+    print(f"{'Enzyme':<20} {label:>18} {'Width':>16} {'Peak':>8}")
+    for name, opt, opt_err, width, width_err, peak in zip(
+            result.enzymes, result.optimum, result.optimum_err, result.width, result.width_err, result.peak):
+        print(f"{name:<20} {opt:>9.2f} ± {opt_err:<6.2f} {width:>7.2f} ± {width_err:<6.2f} {peak:>8.3f}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Enzyme activity vs temperature and pH")
+    parser.add_argument("--plots", nargs="+", choices=PLOTS, default=list(PLOTS),
+                        help="Plots to draw (default: all)")
+    parser.add_argument("--output", metavar="DIR",
+                        help="Write the plots as files into DIR instead of showing them")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="File format with --output")
+    parser.add_argument("--dpi", type=int, default=100, help="Resolution of PNG files (default: %(default)s)")
+    parser.add_argument("--temp-optimum", type=float, default=37, help="Optimum temperature in °C")
+    parser.add_argument("--temp-width", type=float, default=10, help="Temperature sensitivity (curve width)")
+    parser.add_argument("--ph-optimum", type=float, default=7, help="Optimum pH")
+    parser.add_argument("--ph-width", type=float, default=1.5, help="pH sensitivity (curve width)")
+    parser.add_argument("--temp-range", type=float, nargs=2, default=TEMP_RANGE, metavar=("MIN", "MAX"))
+    parser.add_argument("--ph-range", type=float, nargs=2, default=PH_RANGE, metavar=("MIN", "MAX"))
+    parser.add_argument("--resolution", type=int, default=RESOLUTION,
+                        help="Points along each axis (default: %(default)s)")
+    parser.add_argument("--batch", metavar="CSV",
+                        help="Render the plots for every enzyme in a table (columns: enzyme, temp_optimum, "
+                             "temp_width, ph_optimum, ph_width, resolution) into --output")
+    parser.add_argument("--workers", type=int, help="Processes for --batch (default: all CPUs)")
+    parser.add_argument("--force", action="store_true", help="With --batch, redraw figures even if unchanged")
+    parser.add_argument("--fit", metavar="CSV",
+                        help="Estimate optimum and width per enzyme from measured activity "
+                             "(columns: enzyme, temp or ph, activity) instead of plotting")
+    parser.add_argument("--fit-output", metavar="CSV", help="Write the --fit results to this file")
+    parser.add_argument("--kinetics", metavar="CSV",
+                        help="Simulate Michaelis-Menten reactions for each row (columns: temp, ph, s0, vmax, km)")
+    parser.add_argument("--kinetics-output", metavar="CSV", default="kinetics.csv",
+                        help="Where --kinetics writes its results (default: %(default)s)")
+    parser.add_argument("--t-end", type=float, default=KINETICS_T_END, help="Simulated time (default: %(default)s)")
+    parser.add_argument("--samples", type=int, default=KINETICS_SAMPLES,
+                        help="Output time points per reaction (default: %(default)s)")
+    parser.add_argument("--dt", type=float, help="Fixed time step for every reaction (default: chosen per reaction from Km / Vmax)")
+    parser.add_argument("--adaptive", action="store_true", help="Use an adaptive step size per reaction")
+    parser.add_argument("--memory-mb", type=float, default=KINETICS_MEMORY_MB,
+                        help="Memory budget per batch of reactions (default: %(default)s)")
 
+    args = parser.parse_args()
+    if args.batch:
+        batch_main(args.batch, args.output or "figures", args.plots, args.format, args.dpi, args.workers, args.force)
+        return
+    if args.fit:
+        fit_main(args.fit, args.fit_output)
+        return
+    if args.kinetics:
+        count, elapsed = run_kinetics(read_conditions(args.kinetics), args.kinetics_output, args.t_end,
+                                      args.samples, args.memory_mb, dt=args.dt, adaptive=args.adaptive,
+                                      temp_optimum=args.temp_optimum, temp_width=args.temp_width,
+                                      ph_optimum=args.ph_optimum, ph_width=args.ph_width)
+        print(f"Simulated {count:,} reactions in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} reactions/s)")
+        print(f"Saved {args.kinetics_output}")
+        return
+    params = enzyme_params(args.temp_optimum, args.temp_width, args.ph_optimum, args.ph_width,
+                           args.temp_range, args.ph_range, args.resolution)
+    paths = render(args.plots, params, args.output, args.format, args.dpi)
+    for path in paths:
+        print(f"Saved {path}")
 
 
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,34 @@
 
 #!/usr/bin/env python3
 """
-Food Chain Simulator — with trophic validation + random batch mode (CSV export)
+Food Chain Simulator — with trophic validation + random batch mode (CSV export) + bulk CSV validation
 
 Usage:
     python simulator.py
     python simulator.py --random 10   # generate 10 random chains → chains.csv
+    python simulator.py --random 100000000 --format binary   # streamed, constant memory → chains.bin
+    python simulator.py --random 100000000 --seed 42 --workers 0   # reproducible, on every core
+    python simulator.py --validate chains.csv --report invalid.csv   # check a large CSV
 """
 
 import argparse
 import csv
+import functools
+import io
+import json
+import os
 import random
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+try:
+    import numpy as np
+except ImportError:  # streaming still works without NumPy, just slower
+    np = None
 
 # Trophic levels in order (strict logic)
 TROPHIC_LEVELS = [
@@ -30,6 +48,27 @@ ORGANISMS = {
     "Apex predator": ["Eagle", "Shark", "Lion", "Tiger"]
 }
 
+# Reverse index: organism → the trophic level(s) it belongs to
+ORGANISM_LEVELS = {}
+for _level in TROPHIC_LEVELS:
+    for _organism in ORGANISMS[_level]:
+        ORGANISM_LEVELS.setdefault(_organism, set()).add(_level)
+
+# Chains generated and written per batch in --random mode
+CHUNK_SIZE = 1 << 18
+
+# Largest number of distinct chains for which every CSV row is prebuilt
+LINE_TABLE_LIMIT = 1 << 16
+
+# Characters of CSV read per chunk when validating
+VALIDATE_CHUNK_CHARS = 1 << 22
+
+# Binary format: magic, uint32 length of a JSON dictionary of levels/organisms,
+# then one byte per level per chain (the organism's index in ORGANISMS[level])
+BINARY_MAGIC = b"FOODCHN1"
+FORMATS = ("csv", "binary")
+DEFAULT_OUTPUT = {"csv": "chains.csv", "binary": "chains.bin"}
+
 def choose_from(level, options):
     """Let user choose an organism or pick random."""
     print(f"\n{level}:")
@@ -57,8 +96,8 @@ def validate_chain(chain):
         return False
 
     # Validate each organism belongs to correct trophic level
-    for org, level in chain.items():
-        if org not in ORGANISMS[level]:
+    for level, org in chain.items():
+        if level not in ORGANISM_LEVELS.get(org, ()):
             return False
 
     return True
@@ -98,19 +137,342 @@ def export_csv(chains, filename="chains.csv"):
     print(f"\n✔ Exported {len(chains)} chains to {filename}")
 
 
+# ---------- STREAMING BATCH MODE ----------
+# Chains are handled as index arrays: one row per chain, one column per trophic
+# level, each entry an index into ORGANISMS[level]. Nothing else is kept in memory.
+
+def new_seed():
+    """A fresh master seed, for runs where none was given (print it to reproduce the run)."""
+    return random.SystemRandom().randrange(1 << 63)
+
+
+def shard_rng(seed, shard):
+    """Independent random stream for one shard, derived from the master seed.
+
+    Shard i always gets the same stream for a given seed, however many processes
+    share the work, so the output depends only on the seed and the chunk size.
+    """
+    if np is not None:
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+    return random.Random(f"{seed}/{shard}")
+
+
+def random_index_batch(rows, rng):
+    """A (rows, levels) uint8 index array of random chains (a list of bytes rows without NumPy)."""
+    sizes = [len(ORGANISMS[level]) for level in TROPHIC_LEVELS]
+    if np is not None:
+        batch = np.empty((rows, len(sizes)), dtype=np.uint8)
+        for column, size in enumerate(sizes):
+            batch[:, column] = rng.integers(0, size, rows, dtype=np.uint8)
+        return batch
+    columns = [rng.choices(range(size), k=rows) for size in sizes]
+    return [bytes(row) for row in zip(*columns)]
+
+
+def _shards(n, chunk_size):
+    """(shard number, rows) pairs covering n chains."""
+    return [(shard, min(chunk_size, n - start)) for shard, start in enumerate(range(0, n, chunk_size))]
+
+
+def random_index_batches(n, chunk_size=CHUNK_SIZE, seed=None):
+    """Yield index batches covering n random chains, shard by shard."""
+    seed = new_seed() if seed is None else seed
+    for shard, rows in _shards(n, chunk_size):
+        yield random_index_batch(rows, shard_rng(seed, shard))
+
+
+def _csv_line(names):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(names)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _line_table():
+    """Every possible CSV row, indexed by the chain's mixed-radix code (None if there are too many)."""
+    options = [ORGANISMS[level] for level in TROPHIC_LEVELS]
+    combos = 1
+    for names in options:
+        combos *= len(names)
+    if combos > LINE_TABLE_LIMIT:
+        return None
+    table = [_csv_line(names) for names in product(*options)]
+    return np.array(table, dtype=object) if np is not None else table
+
+
+def _chain_codes(batch):
+    """Mixed-radix code of each row: ((i0 * n1 + i1) * n2 + i2) ..., matching _line_table()."""
+    codes = np.zeros(len(batch), dtype=np.int64)
+    for column, level in enumerate(TROPHIC_LEVELS):
+        codes = codes * len(ORGANISMS[level]) + batch[:, column]
+    return codes
+
+
+def _row_code(row, names):
+    """_chain_codes() for a single row, without NumPy."""
+    code = 0
+    for options, i in zip(names, row):
+        code = code * len(options) + i
+    return code
+
+
+def encode_csv(batch):
+    """CSV rows (same layout as export_csv) for one index batch."""
+    table = _line_table()
+    names = [ORGANISMS[level] for level in TROPHIC_LEVELS]
+    if table is None:
+        return "".join(_csv_line([names[c][i] for c, i in enumerate(row)]) for row in batch)
+    if np is not None:
+        return "".join(table[_chain_codes(batch)])
+    return "".join(table[_row_code(row, names)] for row in batch)
+
+
+def encode_binary(batch):
+    """Records of the binary format for one index batch."""
+    return batch.tobytes() if np is not None else b"".join(batch)
+
+
+def binary_header():
+    dictionary = json.dumps({"levels": TROPHIC_LEVELS,
+                             "organisms": [ORGANISMS[level] for level in TROPHIC_LEVELS]}).encode()
+    return BINARY_MAGIC + struct.pack("<I", len(dictionary)) + dictionary
+
+
+def write_csv_batches(batches, out):
+    """Write index batches as CSV rows (same layout as export_csv) to an open text file."""
+    out.write(_csv_line(TROPHIC_LEVELS))
+    count = 0
+    for batch in batches:
+        out.write(encode_csv(batch))
+        count += len(batch)
+    return count
+
+
+def write_binary_batches(batches, out):
+    """Write index batches in the dictionary-encoded binary format to an open binary file."""
+    out.write(binary_header())
+    count = 0
+    for batch in batches:
+        out.write(encode_binary(batch))
+        count += len(batch)
+    return count
+
+
+def read_binary(path, chunk_size=CHUNK_SIZE):
+    """Yield chains as dicts (level → organism) from a file written by write_binary_batches."""
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a food chain binary file")
+        (length,) = struct.unpack("<I", f.read(4))
+        dictionary = json.loads(f.read(length))
+        levels, organisms = dictionary["levels"], dictionary["organisms"]
+        width = len(levels)
+        while True:
+            block = f.read(chunk_size * width)
+            if not block:
+                return
+            for start in range(0, len(block) - width + 1, width):
+                yield {level: organisms[c][i]
+                       for c, (level, i) in enumerate(zip(levels, block[start:start + width]))}
+
+
+def _encode_shard(job):
+    """Worker task: generate one shard and return its encoded bytes."""
+    seed, shard, rows, fmt = job
+    batch = random_index_batch(rows, shard_rng(seed, shard))
+    return encode_binary(batch) if fmt == "binary" else encode_csv(batch).encode("utf-8")
+
+
+def export_random(n, filename=None, fmt="csv", chunk_size=CHUNK_SIZE, seed=None, workers=1):
+    """Generate n random chains and stream them to filename in chunks.
+
+    Each chunk is a shard with its own random stream (shard_rng), so with a seed
+    the file is identical for any number of workers. With workers > 1 shards are
+    generated and encoded in a process pool and written in shard order; at most
+    two shards per worker are in flight, so memory depends on chunk_size, not n.
+    Returns (chains written, seconds).
+    """
+    filename = filename or DEFAULT_OUTPUT[fmt]
+    seed = new_seed() if seed is None else seed
+    start = time.perf_counter()
+    if workers <= 1:
+        batches = random_index_batches(n, chunk_size, seed)
+        if fmt == "binary":
+            with open(filename, "wb") as f:
+                count = write_binary_batches(batches, f)
+        else:
+            with open(filename, "w", newline="", encoding="utf-8") as f:
+                count = write_csv_batches(batches, f)
+        return count, time.perf_counter() - start
+
+    count = 0
+    with open(filename, "wb") as f, ProcessPoolExecutor(workers) as pool:
+        f.write(binary_header() if fmt == "binary" else _csv_line(TROPHIC_LEVELS).encode("utf-8"))
+        in_flight = deque()
+        for shard, rows in _shards(n, chunk_size):
+            in_flight.append((rows, pool.submit(_encode_shard, (seed, shard, rows, fmt))))
+            if len(in_flight) >= 2 * workers:
+                rows, future = in_flight.popleft()
+                f.write(future.result())
+                count += rows
+        for rows, future in in_flight:
+            f.write(future.result())
+            count += rows
+    return count, time.perf_counter() - start
+
+
+# ---------- BULK VALIDATION ----------
+
+def row_problem(row, levels=TROPHIC_LEVELS):
+    """Why a CSV row (organisms in `levels` order) is not a valid chain, or None if it is."""
+    if len(row) != len(levels):
+        return f"expected {len(levels)} columns, got {len(row)}"
+    problems = []
+    for level, org in zip(levels, row):
+        found = ORGANISM_LEVELS.get(org)
+        if not found:
+            problems.append(f"unknown organism {org!r} as {level}")
+        elif level not in found:
+            actual = " / ".join(lvl for lvl in TROPHIC_LEVELS if lvl in found)
+            problems.append(f"{org} belongs to {actual}, not {level}")
+    return "; ".join(problems) or None
+
+
+def _header_levels(header, path):
+    """The trophic level of each column, from a header naming all levels in any order."""
+    by_name = {level.lower(): level for level in TROPHIC_LEVELS}
+    levels = [by_name.get(name.strip().lower()) for name in header]
+    if None in levels or sorted(levels) != sorted(TROPHIC_LEVELS):
+        raise ValueError(f"{path}: header must name each trophic level once "
+                         f"({', '.join(TROPHIC_LEVELS)}), got {header}")
+    return levels
+
+
+@functools.lru_cache(maxsize=None)
+def _valid_lines(levels):
+    """Every valid CSV line for this column order, with CRLF and LF endings (None if too many)."""
+    options = [ORGANISMS[level] for level in levels]
+    combos = 1
+    for names in options:
+        combos *= len(names)
+    if combos > LINE_TABLE_LIMIT:
+        return None
+    lines = set()
+    for names in product(*options):
+        line = _csv_line(names)
+        lines.add(line)
+        lines.add(line[:-2] + "\n")
+    return frozenset(lines)
+
+
+def iter_invalid_rows(path, stats=None, chunk_chars=VALIDATE_CHUNK_CHARS):
+    """Yield (line number, row, reason) for every invalid chain in a CSV file.
+
+    The file is read in chunks of about chunk_chars. Lines that exactly match one
+    of the precomputed valid rows (there are only a few thousand) are accepted by
+    a set lookup, a whole chunk at a time; only the rest are parsed with the csv
+    module and checked against the organism → level index to find the reason.
+    Records are expected one per line. If stats is given, stats["rows"] is set
+    to the number of data rows checked.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        levels = _header_levels(next(csv.reader([f.readline()]), []), path)
+        valid = _valid_lines(tuple(levels)) or frozenset()
+        line_no, rows = 1, 0
+        while True:
+            lines = f.readlines(chunk_chars)
+            if not lines:
+                break
+            rows += len(lines)
+            if not valid.issuperset(lines):
+                for offset, line in enumerate(lines, line_no + 1):
+                    if line in valid:
+                        continue
+                    row = next(csv.reader([line]), None)
+                    if not row:
+                        rows -= 1  # blank line
+                        continue
+                    reason = row_problem(row, levels)
+                    if reason:
+                        yield offset, row, reason
+            line_no += len(lines)
+            if stats is not None:
+                stats["rows"] = rows
+    if stats is not None:
+        stats["rows"] = rows
+
+
+def validate_csv(path, report=None):
+    """Check every row of a chains CSV, printing (or writing to a report CSV) each invalid one.
+
+    Returns (rows checked, invalid rows, seconds).
+    """
+    stats = {"rows": 0}
+    invalid = 0
+    start = time.perf_counter()
+    out = open(report, "w", newline="", encoding="utf-8") if report else None
+    try:
+        writer = csv.writer(out) if out else None
+        if writer:
+            writer.writerow(["line", "reason", "row"])
+        for line_no, row, reason in iter_invalid_rows(path, stats):
+            invalid += 1
+            if writer:
+                writer.writerow([line_no, reason, ",".join(row)])
+            else:
+                print(f"✘ line {line_no}: {reason}")
+    finally:
+        if out:
+            out.close()
+    return stats["rows"], invalid, time.perf_counter() - start
+
+
 def main():
     parser = argparse.ArgumentParser(description="Food Chain Simulator")
     parser.add_argument("--random", type=int,
                         help="Generate N random food chains and export to CSV")
+    parser.add_argument("--format", choices=FORMATS, default="csv",
+                        help="Output format for --random (binary = compact dictionary-encoded file)")
+    parser.add_argument("--output", help="Output file for --random (default: chains.csv / chains.bin)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Chains generated and written per batch")
+    parser.add_argument("--validate", metavar="CSV",
+                        help="Check every row of a chains CSV and report the invalid ones")
+    parser.add_argument("--report", metavar="CSV",
+                        help="With --validate, write invalid rows and reasons here instead of printing them")
+    parser.add_argument("--seed", type=int,
+                        help="Master seed for --random; the same seed gives the same file (default: random)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes generating --random shards (default: 1; 0 = all CPUs)")
 
     args = parser.parse_args()
 
+    if args.validate:
+        try:
+            rows, invalid, elapsed = validate_csv(args.validate, args.report)
+        except ValueError as e:
+            print(f"✘ {e}")
+            sys.exit(1)
+        if args.report:
+            print(f"Invalid rows written to {args.report}")
+        mark = "✔" if not invalid else "✘"
+        print(f"\n{mark} {rows} rows checked, {invalid} invalid "
+              f"in {elapsed:.2f}s — {rows / max(elapsed, 1e-9):,.0f} rows/s")
+        if invalid:
+            sys.exit(1)
+        return
+
     # Random batch generation mode
     if args.random:
         n = args.random
-        print(f"Generating {n} random valid chains...")
-        chains = [build_chain_random() for _ in range(n)]
-        export_csv(chains)
+        seed = new_seed() if args.seed is None else args.seed
+        workers = args.workers or os.cpu_count() or 1
+        print(f"Generating {n} random valid chains (seed {seed}, {workers} worker{'s' * (workers > 1)})...")
+        count, elapsed = export_random(n, args.output, args.format, args.chunk_size, seed, workers)
+        filename = args.output or DEFAULT_OUTPUT[args.format]
+        size_mb = os.path.getsize(filename) / 1e6
+        print(f"\n✔ Exported {count} chains to {filename} ({size_mb:,.1f} MB) "
+              f"in {elapsed:.2f}s — {count / max(elapsed, 1e-9):,.0f} chains/s")
         return
 
     # Normal interactive mode
@@ -1,39 +1,62 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
-# Load data
-df = pd.read_csv("heart_rate.csv")
 
-# Separate resting and active rates
-resting = df[df['activity'] == 'rest']['heart_rate']
-active = df[df['activity'] != 'rest']['heart_rate']
+def load_data(filename="heart_rate.csv"):
+    """Load the heart rate log (time, activity, heart_rate)."""
+    return pd.read_csv(filename)
 
-print("---- HEART RATE SUMMARY ----")
-print(f"Resting Heart Rate: Mean={resting.mean():.2f}, Min={resting.min()}, Max={resting.max()}")
-print(f"Active Heart Rate:  Mean={active.mean():.2f}, Min={active.min()}, Max={active.max()}")
 
-# Plot
-plt.figure(figsize=(7,5))
-plt.plot(df['heart_rate'], marker='o')
-plt.title("Heart Rate Over Time")
-plt.xlabel("Time Index")
-plt.ylabel("Heart Rate (bpm)")
-plt.grid(True)
-plt.show()
+def split_rates(df):
+    """Separate resting and active heart rates."""
+    resting = df[df['activity'] == 'rest']['heart_rate']
+    active = df[df['activity'] != 'rest']['heart_rate']
+    return resting, active
 
-# Plot Resting vs Active comparison
-plt.figure(figsize=(7,5))
-plt.bar(["Resting", "Active"],
-        [resting.mean(), active.mean()])
-plt.title("Average Resting vs Active Heart Rate")
-plt.ylabel("Heart Rate (bpm)")
-plt.show()
 
-# Save summary to file
-with open("heart_rate_summary.txt", "w") as f:
-    f.write("---- HEART RATE SUMMARY ----\n")
-    f.write(f"Resting Heart Rate: Mean={resting.mean():.2f}, Min={resting.min()}, Max={resting.max()}\n")
-    f.write(f"Active Heart Rate:  Mean={active.mean():.2f}, Min={active.min()}, Max={active.max()}\n")                  
+def summary_lines(resting, active):
+    """Summary statistics as printable lines."""
+    return [
+        "---- HEART RATE SUMMARY ----",
+        f"Resting Heart Rate: Mean={resting.mean():.2f}, Min={resting.min()}, Max={resting.max()}",
+        f"Active Heart Rate:  Mean={active.mean():.2f}, Min={active.min()}, Max={active.max()}",
+    ]
 
 
+def plot_heart_rate(df, resting, active):
+    import matplotlib.pyplot as plt
 
+    # Plot
+    plt.figure(figsize=(7,5))
+    plt.plot(df['heart_rate'], marker='o')
+    plt.title("Heart Rate Over Time")
+    plt.xlabel("Time Index")
+    plt.ylabel("Heart Rate (bpm)")
+    plt.grid(True)
+    plt.show()
+
+    # Plot Resting vs Active comparison
+    plt.figure(figsize=(7,5))
+    plt.bar(["Resting", "Active"],
+            [resting.mean(), active.mean()])
+    plt.title("Average Resting vs Active Heart Rate")
+    plt.ylabel("Heart Rate (bpm)")
+    plt.show()
+
+
+def main():
+    # Load data
+    df = load_data()
+    resting, active = split_rates(df)
+
+    lines = summary_lines(resting, active)
+    print("\n".join(lines))
+
+    plot_heart_rate(df, resting, active)
+
+    # Save summary to file
+    with open("heart_rate_summary.txt", "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ def classify_plant():
     seeds = input("Seeds present? (yes/no): ").lower()
     vascular = input("Vascular tissue present? (yes/no): ").lower()
 
+    return classify(leaf_type, venation, symmetry, seeds, vascular)
+
+
+def classify(leaf_type, venation, symmetry, seeds, vascular):
     # ----------- Logic -------------
     if vascular == "no" and seeds == "no":
         return "Bryophyte"
@@ -29,5 +33,6 @@ def classify_plant():
     return "Could not classify — check inputs."
 
 
-result = classify_plant()
-print("\nPlant Group:", result)
+if __name__ == "__main__":
+    result = classify_plant()
+    print("\nPlant Group:", result)